@@ -0,0 +1,50 @@
+"""Throughput of the batch BMR/TDEE functions against the scalar ones.
+
+python -m benchmarks.bench_energy --size 2000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import population
+from caltrack.energy import calculate_bmr, calculate_tdee, energy_targets
+
+
+def scalar(people):
+    return [
+        calculate_tdee(calculate_bmr(age, gender, weight, height), level)
+        for age, gender, weight, height, level in people.itertuples(index=False)
+    ]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2_000_000)
+    parser.add_argument(
+        "--scalar-size",
+        type=int,
+        default=20_000,
+        help="people run through the scalar functions, extrapolated to --size",
+    )
+    args = parser.parse_args()
+
+    people = population(args.size)
+    targets, batch_seconds = timed(energy_targets, people)
+
+    sample = people.iloc[: args.scalar_size]
+    expected, scalar_seconds = timed(scalar, sample)
+    np.testing.assert_allclose(targets["TDEE"].to_numpy()[: len(sample)], expected)
+    scalar_seconds *= args.size / len(sample)
+
+    print(f"{args.size:,} people")
+    print(f"batch:  {batch_seconds:8.3f} s  {args.size / batch_seconds:14,.0f} /s")
+    print(f"scalar: {scalar_seconds:8.3f} s  {args.size / scalar_seconds:14,.0f} /s")
+    print(f"speedup: {scalar_seconds / batch_seconds:.0f}x")
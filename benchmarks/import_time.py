@@ -0,0 +1,99 @@
+"""Import-time report for the app shell, the page modules and the engine.
+
+Imports each target in a fresh interpreter under ``python -X importtime``
+and reports its cumulative import time and the heavy libraries it pulled
+in. Page modules are measured after ``streamlit``, which every page needs
+anyway. With ``--check`` the script exits non-zero when a target exceeds
+its budget in import_budget.json or imports a library it must not, so CI
+can hold the startup time:
+
+    python -m benchmarks.import_time --check
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "import_budget.json"
+)
+
+HEAVY_MODULES = ("numpy", "pandas", "plotly.express", "matplotlib", "streamlit")
+
+
+def measure(module, preload=()):
+    # Cumulative import time of module in microseconds, and every module imported
+    code = "".join(f"import {m}; " for m in (*preload, module))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if not total.strip().isdigit():
+            continue
+        imported.add(name.strip())
+        if name.rstrip() == f" {module}":
+            cumulative = int(total)
+    return cumulative, imported
+
+
+def report(budgets, repeat):
+    rows = []
+    for module, budget in budgets.items():
+        preload = budget.get("after", [])
+        runs = [measure(module, preload) for _ in range(repeat)]
+        micros = min(r[0] for r in runs)
+        imported = runs[0][1] - set().union(*(measure(m)[1] for m in preload))
+        heavy = [m for m in HEAVY_MODULES if m in imported]
+        forbidden = [m for m in budget.get("forbid", []) if m in imported]
+        rows.append(
+            {
+                "module": module,
+                "ms": micros / 1000,
+                "budget_ms": budget["max_ms"],
+                "heavy": heavy,
+                "forbidden": forbidden,
+                "ok": micros / 1000 <= budget["max_ms"] and not forbidden,
+            }
+        )
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", default=BUDGET_FILE)
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per target, best kept"
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--check", action="store_true", help="fail when over budget")
+    args = parser.parse_args()
+
+    with open(args.budget) as f:
+        rows = report(json.load(f), args.repeat)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        for row in rows:
+            status = "ok" if row["ok"] else "OVER"
+            heavy = ", ".join(row["heavy"]) or "-"
+            if row["forbidden"]:
+                heavy += f"  forbidden: {', '.join(row['forbidden'])}"
+            print(
+                f"{row['module']:<28} {row['ms']:8.1f} ms / {row['budget_ms']:6.0f} ms"
+                f"  {status:<4}  heavy: {heavy}"
+            )
+    if args.check and not all(row["ok"] for row in rows):
+        sys.exit(1)
@@ -0,0 +1,271 @@
+"""Benchmarks of the app's hot paths against stored baselines.
+
+Each case runs on synthetic data at 10, 1k, 100k and 1M rows (catalog
+foods, planned items, progress entries, tracker samples or people; see the
+case for what its size counts). Timings are the best of several repeats.
+``--save`` writes them as the new baseline, ``--check`` fails when a case is
+slower than its baseline by more than ``--threshold``:
+
+    python -m benchmarks.suite --sizes 10 1000 100000 --check
+    python -m benchmarks.suite --save
+"""
+
+import argparse
+import atexit
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks import synthetic
+from caltrack.activity_store import ActivityStore
+from caltrack.chart_data import downsample, frame_key
+from caltrack.coverage import (
+    NutrientDensityIndex,
+    day_coverage,
+    gaps,
+    reference_intakes,
+)
+from caltrack.energy import calculate_bmr, calculate_tdee, energy_targets
+from caltrack.food_catalog import NUTRIENTS
+from caltrack.meal_solver import suggest_day_plan
+from caltrack.nutrition_engine import RunningTotals, batch_nutrition
+from caltrack.progress_log import ProgressLog
+from caltrack.recommender import DIET_SPLITS, MealRecommender
+from caltrack.tracker import MockFitnessTracker
+from caltrack.tracker_ingest import ReplaySource
+
+SIZES = (10, 1_000, 100_000, 1_000_000)
+BASELINE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baselines.json"
+)
+
+# Cases are setup functions: they build the data for a size, untimed, and
+# return the function to time. Each case name maps to (setup, sizes).
+CASES = {}
+
+
+def case(name, sizes=SIZES):
+    def register(setup):
+        CASES[name] = (setup, sizes)
+        return setup
+
+    return register
+
+
+@case("meal_nutrition")
+def meal_nutrition(size):
+    # size planned items across plans of 8: batch totals, then one edit
+    catalog = synthetic.food_catalog(1_000)
+    plan_ids, meal_ids, rows, grams = synthetic.meal_plans(catalog, size)
+    n_plans = int(plan_ids[-1]) + 1
+    totals = RunningTotals(catalog)
+
+    def run():
+        batch_nutrition(catalog, plan_ids, meal_ids, rows, grams, n_plans)
+        totals.add("Lunch", catalog.names[0], 150)
+
+    return run
+
+
+@case("suggest_meal_plan")
+def suggest_meal_plan(size):
+    # size catalog foods, a different calorie goal on each call
+    catalog = synthetic.food_catalog(size)
+    goals = itertools.cycle(range(1_500, 3_500, 10))
+    return lambda: suggest_day_plan(catalog, next(goals))
+
+
+@case("meal_recommendations")
+def meal_recommendations(size):
+    # size catalog foods; the recommender is built once per process
+    recommender = MealRecommender(synthetic.food_catalog(size), cache_size=0)
+    diets = list(DIET_SPLITS)
+
+    def run():
+        for diet in diets:
+            recommender.recommend(diet, 2_000)
+
+    return run
+
+
+@case("nutrient_coverage")
+def nutrient_coverage(size):
+    # size catalog foods: coverage of an 8 item day and foods for each gap,
+    # from a density index built once per process
+    catalog = synthetic.food_catalog(size)
+    index = NutrientDensityIndex(catalog)
+    _, _, rows, grams = synthetic.meal_plans(catalog, 8)
+    totals = catalog.totals(rows, grams)
+    planned = [catalog.names[row] for row in rows]
+
+    def run():
+        targets, limits = reference_intakes(45, "Female", 2_000)
+        coverage = day_coverage(catalog, rows, totals, targets, limits)
+        for nutrient in gaps(coverage, below=200):
+            i = NUTRIENTS.index(nutrient)
+            index.closers(nutrient, targets[i] - totals[i], planned)
+        for vitamin in catalog.vitamins:
+            index.closers(vitamin, exclude=planned)
+
+    return run
+
+
+@case("log_progress")
+def log_progress(size):
+    # 1000 appends onto a log of size entries, plus one backdated entry
+    history = synthetic.progress_history(size + 1_000)
+    log = ProgressLog.from_frame(history.iloc[:size])
+    entries = history.iloc[size:].to_dict("records")
+    backdated = dict(entries[0], Date=history["Date"].iloc[size // 2])
+    hour = pd.Timedelta(hours=1)
+
+    def run():
+        # Dated after the latest entry, so repeated runs still append in order
+        last = pd.Timestamp(log.column("Date")[-1])
+        for i, entry in enumerate(entries, 1):
+            entry["Date"] = last + i * hour
+            log.append(entry)
+        log.append(backdated)
+
+    return run
+
+
+@case("view_progress")
+def view_progress(size):
+    # Sort check, window, chart key and downsampling over size entries
+    log = ProgressLog.from_frame(synthetic.progress_history(size))
+    start = (pd.Timestamp.now() - pd.Timedelta(days=365)).date()
+
+    def run():
+        for window in (start, None):
+            log.version += 1  # as after a new entry, so nothing is cached
+            frame = log.window(window)
+            frame_key(frame, "Date", "Weight")
+            downsample(frame, "Date", "Weight")
+
+    return run
+
+
+@case("tracker_get_data")
+def tracker_get_data(size):
+    # size minute samples in an on-disk activity store
+    root = tempfile.mkdtemp(prefix="caltrack-bench-")
+    atexit.register(shutil.rmtree, root, ignore_errors=True)
+    path = os.path.join(root, "samples.csv")
+    synthetic.tracker_samples(size).to_csv(path, index=False)
+    tracker = MockFitnessTracker(ReplaySource(path), ActivityStore(root))
+    tracker.connect()
+
+    def run():
+        for days in (7, 30, 365):
+            tracker.get_data(days)
+
+    return run
+
+
+@case("energy_batch")
+def energy_batch(size):
+    people = synthetic.population(size)
+    return lambda: energy_targets(people)
+
+
+@case("energy_scalar", sizes=SIZES[:3])
+def energy_scalar(size):
+    people = list(synthetic.population(size).itertuples(index=False))
+
+    def run():
+        for age, gender, weight, height, level in people:
+            calculate_tdee(calculate_bmr(age, gender, weight, height), level)
+
+    return run
+
+
+def measure(function, repeat=5, min_time=0.05):
+    # Best seconds per call, looping fast functions to at least min_time
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000:
+            break
+        loops *= 10
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best / loops
+
+
+def run_suite(names, sizes, repeat):
+    results = {}
+    for name in names:
+        setup, case_sizes = CASES[name]
+        for size in sizes:
+            if size not in case_sizes:
+                continue
+            seconds = measure(setup(size), repeat)
+            results[f"{name}/{size}"] = seconds
+            print(f"{name:<22} {size:>9,}  {seconds * 1000:12.3f} ms", flush=True)
+    return results
+
+
+def regressions(results, baseline, threshold):
+    # Cases slower than their baseline by more than threshold (0.25 = 25%)
+    return {
+        key: (seconds, baseline[key])
+        for key, seconds in results.items()
+        if key in baseline and seconds > baseline[key] * (1 + threshold)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help=f"any of {', '.join(CASES)}")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="store as baseline")
+    parser.add_argument("--check", action="store_true", help="fail on regressions")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown over the baseline, as a fraction",
+    )
+    args = parser.parse_args()
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = run_suite(args.cases or list(CASES), args.sizes, args.repeat)
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+
+    if args.check:
+        with open(args.baseline) as f:
+            slower = regressions(results, json.load(f), args.threshold)
+        for key, (seconds, before) in slower.items():
+            print(
+                f"REGRESSION {key}: {seconds * 1000:.3f} ms, baseline "
+                f"{before * 1000:.3f} ms (+{seconds / before - 1:.0%})"
+            )
+        if slower:
+            sys.exit(1)
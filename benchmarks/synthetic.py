@@ -0,0 +1,97 @@
+"""Synthetic catalogs, plans and histories for the benchmarks.
+
+Everything is generated from a seed, so a size always yields the same data
+and timings stay comparable between runs.
+"""
+
+import numpy as np
+import pandas as pd
+
+from caltrack.energy import ACTIVITY_LEVELS, GENDERS
+from caltrack.food_catalog import FoodCatalog
+from caltrack.nutrition_engine import MEALS
+from caltrack.progress_store import PROGRESS_COLUMNS
+
+VITAMINS = ("A", "B12", "B6", "C", "D", "E", "K")
+TAGS = ("vegan", "vegetarian")
+
+
+def food_catalog(size, seed=0):
+    # Foods with consistent macros: calories follow from protein/carbs/fat
+    rng = np.random.default_rng(seed)
+    shares = rng.dirichlet([1.0, 1.5, 1.0], size)
+    density = rng.uniform(20, 600, size)  # kcal per 100 g
+    protein, carbs, fat = (shares * density[:, None] / [4, 4, 9]).T
+    matrix = np.vstack(
+        [
+            4 * protein + 4 * carbs + 9 * fat,
+            protein,
+            carbs,
+            fat,
+            carbs * rng.uniform(0, 0.3, size),  # fiber
+            carbs * rng.uniform(0, 0.5, size),  # sugar
+            rng.uniform(0, 800, size),  # sodium
+            rng.uniform(0, 900, size),  # potassium
+        ]
+    )
+    names = [f"Food {i:07d}" for i in range(size)]
+    vitamin_masks = rng.integers(0, 1 << len(VITAMINS), size)
+    vegan = rng.random(size) < 0.3
+    vegetarian = vegan | (rng.random(size) < 0.3)
+    tag_masks = vegan * 1 + vegetarian * 2
+    return FoodCatalog(names, matrix, vitamin_masks, VITAMINS, tag_masks, TAGS)
+
+
+def meal_plans(catalog, items, items_per_plan=8, seed=0):
+    # (plan_id, meal_id, row, grams) arrays for ``items`` planned foods
+    rng = np.random.default_rng(seed)
+    plan_ids = np.arange(items) // items_per_plan
+    meal_ids = rng.integers(0, len(MEALS), items)
+    rows = rng.integers(0, len(catalog), items)
+    grams = rng.integers(20, 400, items).astype(np.float64)
+    return plan_ids, meal_ids, rows, grams
+
+
+def progress_history(size, seed=0):
+    # One entry per hour, ending now, with a slow weight trend
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end=pd.Timestamp.now().floor("h"), periods=size, freq="h")
+    weight = 90 - np.linspace(0, 15, size) + rng.normal(0, 0.5, size)
+    columns = [
+        dates,
+        weight.round(1),
+        rng.uniform(12, 30, size).round(1),
+        rng.uniform(70, 100, size).round(1),
+        rng.uniform(90, 120, size).round(1),
+        rng.uniform(28, 40, size).round(1),
+        rng.uniform(50, 65, size).round(1),
+    ]
+    return pd.DataFrame(dict(zip(PROGRESS_COLUMNS, columns)))
+
+
+def tracker_samples(size, seed=0):
+    # Minute-level tracker samples ending at the current minute
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now().floor("min")
+    steps = rng.poisson(12.0, size)
+    return pd.DataFrame(
+        {
+            "Timestamp": pd.date_range(end=end, periods=size, freq="min"),
+            "Steps": steps,
+            "Heart Rate": (60 + 0.35 * steps + rng.normal(0, 3, size)).round(),
+            "Calories": 1.1 + 0.045 * steps,
+        }
+    )
+
+
+def population(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "Age": rng.integers(18, 90, size),
+            "Gender": rng.choice(GENDERS, size),
+            "Weight": rng.uniform(45, 140, size).round(1),
+            "Height": rng.uniform(150, 200, size).round(1),
+            "Activity Level": rng.choice(ACTIVITY_LEVELS, size),
+        }
+    )
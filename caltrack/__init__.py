@@ -0,0 +1,6 @@
+"""CalTrack Pro engine: nutrition, meal planning, progress and activity logic.
+
+Plain Python, NumPy and pandas only, so batch jobs, workers and benchmarks
+can import it without Streamlit or plotting libraries. The Streamlit app in
+app.py is a thin shell over these modules.
+"""
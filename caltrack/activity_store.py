@@ -0,0 +1,265 @@
+import glob
+import json
+import os
+import shutil
+import threading
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from .tracker_ingest import ACTIVE_STEPS_PER_MINUTE, DAILY_COLUMNS, SAMPLE_COLUMNS
+
+DAILY_DTYPE = np.dtype(
+    [
+        ("date", "datetime64[D]"),
+        ("steps", "f8"),
+        ("calories", "f8"),
+        ("active", "f8"),
+        ("hr_sum", "f8"),
+        ("hr_count", "f8"),
+        ("hr_rest", "f8"),
+    ]
+)
+
+RESOLUTIONS = {"minute": ("minute.npy", "min"), "hour": ("hour.npy", "h")}
+
+
+def _save(path, array):
+    # Write to a temporary file first so readers never see a partial file
+    with open(path + ".tmp", "wb") as f:
+        np.save(f, array)
+    os.replace(path + ".tmp", path)
+
+
+def _load(path, mmap=True):
+    if not os.path.exists(path):
+        return None
+    return np.load(path, mmap_mode="r" if mmap else None)
+
+
+class ActivityStore:
+    """On-disk time-series store for tracker samples, partitioned by day.
+
+    Each day is a directory holding the raw samples as compressed column
+    chunks (``raw-*.npz``, one per ingested chunk) plus minute and hour
+    rollups as plain ``.npy`` files. A store-wide ``daily.npy`` index holds
+    one row of sums per day, kept in memory and swapped whole after each
+    write, so readers on other threads see either the old or the new index.
+    Rollups are read memory-mapped, so dashboard windows never touch raw
+    samples.
+
+    Retention drops raw chunks after ``raw_days``, minute rollups after
+    ``minute_days`` and whole days after ``retention_days``, counted back
+    from the latest day. Works as a TrackerIngestor sink.
+    """
+
+    def __init__(self, root, raw_days=30, minute_days=90, retention_days=730):
+        self.root = root
+        self.raw_days = raw_days
+        self.minute_days = minute_days
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._index = None
+        os.makedirs(root, exist_ok=True)
+
+        self.watermark = None
+        meta = os.path.join(root, "meta.json")
+        if os.path.exists(meta):
+            with open(meta) as f:
+                watermark = json.load(f)["watermark"]
+            self.watermark = pd.Timestamp(watermark) if watermark else None
+
+    def _partition(self, day):
+        return os.path.join(self.root, str(day))
+
+    def _daily_index(self):
+        # Read once; no mapping stays open, so writes can replace the file
+        index = self._index
+        if index is None:
+            with self._index_lock:
+                if self._index is None:
+                    index = _load(os.path.join(self.root, "daily.npy"), mmap=False)
+                    self._index = np.empty(0, DAILY_DTYPE) if index is None else index
+                index = self._index
+        return index
+
+    def update(self, samples):
+        with self._lock:
+            if self.watermark is not None:
+                samples = samples[samples["Timestamp"] > self.watermark]
+            if samples.empty:
+                return 0
+
+            times = samples["Timestamp"].to_numpy("datetime64[ns]")
+            columns = {
+                "steps": samples["Steps"].to_numpy(dtype=np.float64),
+                "calories": samples["Calories"].to_numpy(dtype=np.float64),
+                "heart_rate": samples["Heart Rate"].to_numpy(dtype=np.float64),
+            }
+            days = times.astype("datetime64[D]")
+            rows = [
+                self._update_day(day, times, columns, days == day)
+                for day in np.unique(days)
+            ]
+            self._update_index(np.array(rows, dtype=DAILY_DTYPE))
+
+            self.watermark = pd.Timestamp(times.max())
+            with open(os.path.join(self.root, "meta.json.tmp"), "w") as f:
+                json.dump({"watermark": self.watermark.isoformat()}, f)
+            os.replace(
+                os.path.join(self.root, "meta.json.tmp"),
+                os.path.join(self.root, "meta.json"),
+            )
+            return len(samples)
+
+    def _update_day(self, day, times, columns, mask):
+        partition = self._partition(day)
+        os.makedirs(partition, exist_ok=True)
+
+        chunk = len(glob.glob(os.path.join(partition, "raw-*.npz")))
+        heart_rate = columns["heart_rate"][mask]
+        np.savez_compressed(
+            os.path.join(partition, f"raw-{chunk:05d}.npz"),
+            time=times[mask].view(np.int64),
+            steps=columns["steps"][mask].astype(np.int32),
+            heart_rate=heart_rate.astype(np.float32),
+            calories=columns["calories"][mask].astype(np.float32),
+        )
+
+        # Rollup columns: steps, calories, heart rate sum and sample count
+        minute = (times[mask].astype("datetime64[m]") - day).astype(np.intp)
+        added = np.column_stack(
+            [
+                np.bincount(minute, columns["steps"][mask], minlength=1440),
+                np.bincount(minute, columns["calories"][mask], minlength=1440),
+                np.bincount(minute, np.nan_to_num(heart_rate), minlength=1440),
+                np.bincount(minute, ~np.isnan(heart_rate), minlength=1440),
+            ]
+        )
+        path = os.path.join(partition, "minute.npy")
+        existing = _load(path, mmap=False)
+        minutes = added if existing is None else existing + added
+        _save(path, minutes)
+        hours = minutes.reshape(24, 60, -1).sum(1)
+        _save(os.path.join(partition, "hour.npy"), hours)
+
+        steps, calories, hr_sum, hr_count = minutes.sum(0)
+        active = np.count_nonzero(minutes[:, 0] >= ACTIVE_STEPS_PER_MINUTE)
+        # Resting heart rate is the lowest hourly mean
+        measured = hours[:, 3] > 0
+        rest = (
+            (hours[measured, 2] / hours[measured, 3]).min()
+            if measured.any()
+            else np.nan
+        )
+        return (day, steps, calories, active, hr_sum, hr_count, rest)
+
+    def _update_index(self, rows):
+        index = self._daily_index()
+        latest = index["date"][-1] if len(index) else None
+        index = np.concatenate([index[~np.isin(index["date"], rows["date"])], rows])
+        index = index[np.argsort(index["date"], kind="stable")]
+        if latest is None or index["date"][-1] > latest:
+            index = self._prune(index)
+        # Readers switch to the new index only once it is on disk
+        _save(os.path.join(self.root, "daily.npy"), index)
+        with self._index_lock:
+            self._index = index
+
+    def _prune(self, index):
+        # Apply the retention policy relative to the latest day
+        latest = index["date"][-1]
+        for partition in glob.glob(os.path.join(self.root, "????-??-??")):
+            age = (latest - np.datetime64(os.path.basename(partition))).astype(int)
+            if age > self.retention_days:
+                shutil.rmtree(partition)
+                continue
+            if age > self.minute_days:
+                if os.path.exists(os.path.join(partition, "minute.npy")):
+                    os.remove(os.path.join(partition, "minute.npy"))
+            if age > self.raw_days:
+                for path in glob.glob(os.path.join(partition, "raw-*.npz")):
+                    os.remove(path)
+        return index[(latest - index["date"]).astype(int) <= self.retention_days]
+
+    def daily(self, start=None, end=None):
+        # Daily aggregates between start and end (inclusive)
+        index = self._daily_index()
+        dates = index["date"]
+        first = 0 if start is None else np.searchsorted(dates, _day(start))
+        last = len(dates) if end is None else np.searchsorted(dates, _day(end), "right")
+        days = index[first:last]
+        hr_count = np.where(days["hr_count"] > 0, days["hr_count"], np.nan)
+        return pd.DataFrame(
+            {
+                "Date": days["date"].astype("datetime64[ns]"),
+                "Steps": days["steps"].round().astype(int),
+                "Calories Burned": days["calories"].round().astype(int),
+                "Active Minutes": days["active"].astype(int),
+                "Heart Rate": (days["hr_sum"] / hr_count).round(),
+                "Resting Heart Rate": days["hr_rest"].round(),
+            },
+            columns=DAILY_COLUMNS,
+        )
+
+    def rollup(self, resolution, start, end):
+        # Minute or hour rollups between the days of start and end (inclusive)
+        if resolution == "day":
+            return self.daily(start, end)
+        filename, freq = RESOLUTIONS[resolution]
+        frames = []
+        for day in np.arange(_day(start), _day(end) + 1):
+            values = _load(os.path.join(self._partition(day), filename))
+            if values is None:
+                continue
+            hr_count = np.where(values[:, 3] > 0, values[:, 3], np.nan)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "Timestamp": pd.date_range(
+                            pd.Timestamp(day), periods=len(values), freq=freq
+                        ),
+                        "Steps": values[:, 0],
+                        "Calories": values[:, 1],
+                        "Heart Rate": values[:, 2] / hr_count,
+                    }
+                )
+            )
+        if not frames:
+            return pd.DataFrame(
+                columns=["Timestamp", "Steps", "Calories", "Heart Rate"]
+            )
+        return pd.concat(frames, ignore_index=True)
+
+    def raw(self, day):
+        # Raw samples of one day, if still retained
+        chunks = []
+        for path in sorted(
+            glob.glob(os.path.join(self._partition(_day(day)), "raw-*.npz"))
+        ):
+            with np.load(path) as chunk:
+                chunks.append(
+                    pd.DataFrame(
+                        {
+                            "Timestamp": chunk["time"].view("datetime64[ns]"),
+                            "Steps": chunk["steps"],
+                            "Heart Rate": chunk["heart_rate"],
+                            "Calories": chunk["calories"],
+                        }
+                    )
+                )
+        if not chunks:
+            return pd.DataFrame(columns=SAMPLE_COLUMNS)
+        return pd.concat(chunks, ignore_index=True)
+
+
+def _day(value):
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+def user_root(root, user_id):
+    # Directory of a user's store under root, with the id quoted so it is
+    # always a single path component
+    return os.path.join(root, quote(user_id, safe="").replace(".", "%2E"))
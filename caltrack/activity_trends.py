@@ -0,0 +1,130 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+TREND_METRICS = ["Steps", "Calories Burned", "Active Minutes"]
+LOAD_METRIC = "Active Minutes"  # Training load behind the workload ratio
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+
+class TrendEngine:
+    """Rolling activity trends maintained incrementally from daily aggregates.
+
+    Days are held on a dense calendar from the first synced day, with NaN
+    for days without data. Prefix sums of the values and of the non-missing
+    counts turn every rolling mean into two lookups, so ``update`` with the
+    days changed by a sync costs O(changed days) and ``frame`` costs
+    O(days returned), whatever the length of the history. A day can be
+    updated again (today, as it fills up); everything from it onwards is
+    recomputed.
+    """
+
+    def __init__(self, capacity=64):
+        self.metrics = TREND_METRICS + ["Resting Heart Rate"]
+        self.first_day = None
+        self._size = 0
+        self._values = np.full((len(self.metrics), capacity), np.nan)
+        # Prefix sums carry a leading zero column: sums[:, i] covers days < i
+        self._sums = np.zeros((len(self.metrics), capacity + 1))
+        self._counts = np.zeros((len(self.metrics), capacity + 1))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, size):
+        capacity = self._values.shape[1]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        grow = capacity - self._values.shape[1]
+        self._values = np.pad(self._values, ((0, 0), (0, grow)), constant_values=np.nan)
+        self._sums = np.pad(self._sums, ((0, 0), (0, grow)))
+        self._counts = np.pad(self._counts, ((0, 0), (0, grow)))
+
+    def update(self, daily):
+        # Merge daily aggregates (DAILY_COLUMNS rows) for new or changed days
+        if daily.empty:
+            return
+        dates = daily["Date"].to_numpy("datetime64[D]")
+        values = daily[self.metrics].to_numpy(dtype=np.float64).T
+        with self._lock:
+            if self.first_day is None:
+                self.first_day = dates.min()
+            elif dates.min() < self.first_day:
+                # Backfill before the first day: shift the calendar once
+                shift = int((self.first_day - dates.min()).astype(int))
+                old = self._values[:, : self._size]
+                self._size = 0
+                self._reserve(old.shape[1] + shift)
+                self._values[:, shift : shift + old.shape[1]] = old
+                self._values[:, :shift] = np.nan
+                self._size = old.shape[1] + shift
+                self.first_day = dates.min()
+                self._accumulate(0)
+
+            positions = (dates - self.first_day).astype(np.intp)
+            first, end = positions.min(), max(self._size, positions.max() + 1)
+            self._reserve(end)
+            self._values[:, self._size : end] = np.nan
+            self._values[:, positions] = values
+            self._size = end
+            self._accumulate(first)
+
+    def _accumulate(self, first):
+        # Rebuild the prefix sums from day ``first`` to the end
+        end = self._size
+        block = self._values[:, first:end]
+        present = ~np.isnan(block)
+        sums = np.cumsum(np.where(present, block, 0.0), axis=1)
+        counts = np.cumsum(present, axis=1)
+        self._sums[:, first + 1 : end + 1] = sums + self._sums[:, first : first + 1]
+        self._counts[:, first + 1 : end + 1] = (
+            counts + self._counts[:, first : first + 1]
+        )
+
+    def _rolling(self, positions, days):
+        # Mean over the ``days`` days ending at each position, skipping gaps
+        stop = positions + 1
+        start = np.maximum(stop - days, 0)
+        total = self._sums[:, stop] - self._sums[:, start]
+        count = self._counts[:, stop] - self._counts[:, start]
+        return np.divide(
+            total, count, out=np.full(total.shape, np.nan), where=count > 0
+        )
+
+    def frame(self, start=None):
+        # Trend columns for every calendar day from start onwards
+        with self._lock:
+            if self._size == 0:
+                return pd.DataFrame()
+            first = 0
+            if start is not None:
+                first = np.datetime64(pd.Timestamp(start).date(), "D") - self.first_day
+                first = min(max(int(first.astype(int)), 0), self._size)
+            positions = np.arange(first, self._size)
+            acute = self._rolling(positions, ACUTE_DAYS)
+            chronic = self._rolling(positions, CHRONIC_DAYS)
+            previous = np.full(acute.shape, np.nan)
+            past = positions >= ACUTE_DAYS
+            previous[:, past] = self._rolling(positions[past] - ACUTE_DAYS, ACUTE_DAYS)
+            values = self._values[:, positions]
+
+        columns = {"Date": self.first_day + positions.astype("timedelta64[D]")}
+        for i, metric in enumerate(TREND_METRICS):
+            columns[metric] = values[i]
+            columns[f"{metric} 7d Avg"] = acute[i]
+            columns[f"{metric} 28d Avg"] = chronic[i]
+            columns[f"{metric} WoW %"] = 100 * (acute[i] / previous[i] - 1)
+
+        load = TREND_METRICS.index(LOAD_METRIC)
+        columns["Workload Ratio"] = acute[load] / chronic[load]
+        rest = self.metrics.index("Resting Heart Rate")
+        columns["Resting Heart Rate"] = values[rest]
+        columns["Resting HR Baseline"] = chronic[rest]
+        frame = pd.DataFrame(columns)
+        frame["Date"] = frame["Date"].astype("datetime64[ns]")
+        return frame.replace([np.inf, -np.inf], np.nan)
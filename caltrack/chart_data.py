@@ -0,0 +1,60 @@
+"""Data preparation for charts, kept free of any plotting library."""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+MAX_POINTS = 2000  # Line series longer than this are downsampled with LTTB
+
+
+def frame_key(frame, *params):
+    # Content hash of a DataFrame plus the chart parameters
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(frame.columns), params)).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def lttb(x, y, threshold):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, from each of ``threshold - 2`` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    kept = np.empty(threshold, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        following = slice(end, edges[i + 2] if i + 2 < len(edges) else n)
+        mean_x, mean_y = x[following].mean(), y[following].mean()
+        area = np.abs(
+            (x[previous] - mean_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (mean_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        kept[i + 1] = previous
+    return kept
+
+
+def downsample(frame, x, y, max_points=MAX_POINTS):
+    # Points without a y value are dropped; LTTB can't rank NaN
+    missing = np.isnan(frame[y].to_numpy(dtype=np.float64))
+    if missing.any():
+        frame = frame[~missing]
+    if max_points is None or len(frame) <= max_points:
+        return frame
+    xs = frame[x]
+    if pd.api.types.is_datetime64_any_dtype(xs):
+        xs = xs.astype("int64")
+    kept = lttb(xs.to_numpy(), frame[y].to_numpy(dtype=np.float64), max_points)
+    return frame.iloc[kept]
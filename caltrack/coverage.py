@@ -0,0 +1,195 @@
+"""Daily nutrient coverage against age- and gender-specific reference intakes.
+
+Targets follow the US Dietary Reference Intakes: the RDA or adequate intake
+for protein, carbs, fiber, sodium and potassium, and the middle of the
+acceptable range for the share of energy from fat. Sugar and sodium also
+have an upper limit. The catalog only records which vitamins a food is a
+source of, not how much, so vitamins are covered or missing rather than a
+percentage.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .energy import GENDERS, label_codes
+from .food_catalog import NUTRIENTS
+
+# Lower age of each reference band: 1-3, 4-8, 9-13, 14-18, 19-30, 31-50,
+# 51-70 and 71+
+AGE_BANDS = np.array([1, 4, 9, 14, 19, 31, 51, 71])
+
+# Daily targets per band, male then female
+_TARGETS = {
+    "protein": (
+        (13, 19, 34, 52, 56, 56, 56, 56),
+        (13, 19, 34, 46, 46, 46, 46, 46),
+    ),
+    "carbs": ((130,) * 8, (130,) * 8),
+    "fiber": (
+        (19, 25, 31, 38, 38, 38, 30, 30),
+        (19, 25, 26, 26, 25, 25, 21, 21),
+    ),
+    "sodium": (
+        (800, 1000, 1200, 1500, 1500, 1500, 1500, 1500),
+        (800, 1000, 1200, 1500, 1500, 1500, 1500, 1500),
+    ),
+    "potassium": (
+        (2000, 2300, 2500, 3000, 3400, 3400, 3400, 3400),
+        (2000, 2300, 2300, 2300, 2600, 2600, 2600, 2600),
+    ),
+}
+_LIMITS = {
+    "sodium": (
+        (1200, 1500, 1800, 2300, 2300, 2300, 2300, 2300),
+        (1200, 1500, 1800, 2300, 2300, 2300, 2300, 2300),
+    ),
+}
+# Share of energy from fat (middle of the acceptable range) per band, and
+# the upper limit for sugar
+FAT_ENERGY_SHARE = np.array([0.35, 0.30, 0.30, 0.30, 0.275, 0.275, 0.275, 0.275])
+SUGAR_ENERGY_LIMIT = 0.10
+KCAL_PER_GRAM = {"fat": 9, "sugar": 4}
+
+# Nutrients whose gaps are filled from the catalog; sodium is left out, as
+# suggesting salty foods is rarely what a short day needs
+GAP_NUTRIENTS = ("protein", "carbs", "fat", "fiber", "potassium")
+
+
+def _table(values):
+    # (len(GENDERS), len(AGE_BANDS), len(NUTRIENTS)), NaN where not set;
+    # "Other" averages the male and female values
+    table = np.full((len(GENDERS), len(AGE_BANDS), len(NUTRIENTS)), np.nan)
+    for nutrient, (male, female) in values.items():
+        table[:2, :, NUTRIENTS.index(nutrient)] = male, female
+    table[2] = table[:2].mean(axis=0)
+    return table
+
+
+TARGETS = _table(_TARGETS)
+LIMITS = _table(_LIMITS)
+
+# Daily totals and reference intakes in NUTRIENTS order, with the vitamins
+# in the plan and those it lacks
+Coverage = namedtuple(
+    "Coverage", ["totals", "targets", "limits", "percent", "vitamins", "missing"]
+)
+
+
+def reference_intakes(age, gender, calories):
+    """Daily (targets, limits) in NUTRIENTS order for arrays of people.
+
+    Inputs broadcast against each other; the result has a trailing axis of
+    len(NUTRIENTS) with NaN where a nutrient has no target or limit.
+    ``calories`` is the energy goal, which sets the calorie target and the
+    fat and sugar amounts.
+    """
+    band = np.clip(np.searchsorted(AGE_BANDS, age, side="right") - 1, 0, None)
+    codes = label_codes(gender, GENDERS)
+    codes = np.where(codes < 0, 2, codes)
+    calories = np.asarray(calories, dtype=np.float64)
+
+    targets = TARGETS[codes, band].copy()
+    limits = LIMITS[codes, band].copy()
+    targets[..., NUTRIENTS.index("calories")] = calories
+    targets[..., NUTRIENTS.index("fat")] = (
+        FAT_ENERGY_SHARE[band] * calories / KCAL_PER_GRAM["fat"]
+    )
+    limits[..., NUTRIENTS.index("sugar")] = (
+        SUGAR_ENERGY_LIMIT * calories / KCAL_PER_GRAM["sugar"]
+    )
+    return targets, limits
+
+
+def percent_of(totals, reference):
+    # Totals as a percentage of the reference, NaN where there is none
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.asarray(totals, dtype=np.float64) / reference * 100
+
+
+def day_coverage(catalog, rows, totals, targets, limits):
+    """Coverage of one day's plan from its food rows and nutrient totals."""
+    rows = np.asarray(rows, dtype=np.intp)
+    mask = int(np.bitwise_or.reduce(catalog.vitamin_masks_at(rows), initial=0))
+    vitamins = [v for i, v in enumerate(catalog.vitamins) if mask >> i & 1]
+    missing = [v for v in catalog.vitamins if v not in vitamins]
+    totals = np.asarray(totals, dtype=np.float64)
+    return Coverage(
+        totals, targets, limits, percent_of(totals, targets), vitamins, missing
+    )
+
+
+def gaps(coverage, below=90.0):
+    # Nutrients under ``below`` percent of their target, lowest first
+    percent = coverage.percent
+    return [
+        NUTRIENTS[i]
+        for i in np.argsort(percent)
+        if NUTRIENTS[i] in GAP_NUTRIENTS and percent[i] < below
+    ]
+
+
+def _popcount(masks):
+    bits = np.unpackbits(masks.astype("<u4").view(np.uint8)).reshape(-1, 32)
+    return bits.sum(axis=1)
+
+
+class NutrientDensityIndex:
+    """The foods richest in each nutrient per calorie, ranked once per catalog.
+
+    For every nutrient with a target, and every vitamin, the ``top`` foods by
+    amount per 100 kcal are selected and sorted when the index is built, so
+    closing a gap reads the head of a short list instead of scanning the
+    catalog. Vitamin sources rank by how many vitamins they provide per
+    100 kcal. Calories are floored at ``min_calories`` per 100 g, so
+    near-zero calorie foods don't rank on rounding noise.
+    """
+
+    def __init__(self, catalog, top=256, min_calories=10.0, max_grams=300):
+        self.catalog = catalog
+        self.max_grams = max_grams
+        calories = np.maximum(catalog.column("calories"), min_calories)
+        per_100_kcal = 100 / calories.astype(np.float64)
+        self.ranked = {
+            nutrient: self._top(catalog.column(nutrient) * per_100_kcal, top)
+            for nutrient in GAP_NUTRIENTS
+        }
+        vitamin_density = _popcount(catalog.vitamin_masks) * per_100_kcal
+        for bit, vitamin in enumerate(catalog.vitamins):
+            has = (catalog.vitamin_masks >> np.uint32(bit)) & 1
+            self.ranked[vitamin] = self._top(np.where(has, vitamin_density, 0), top)
+
+    @staticmethod
+    def _top(score, top):
+        # Rows of the highest positive scores, best first
+        candidates = np.flatnonzero(score > 0)
+        if len(candidates) > top:
+            keep = np.argpartition(-score[candidates], top - 1)[:top]
+            candidates = candidates[keep]
+        return candidates[np.argsort(-score[candidates], kind="stable")]
+
+    def closers(self, label, gap=None, exclude=(), limit=3):
+        """Best foods for a nutrient or vitamin as (food, grams) pairs.
+
+        ``gap`` is the amount missing, in the nutrient's unit; grams are what
+        covers it, rounded up to 5 g and capped at ``max_grams``. Vitamins,
+        or a missing gap, get a 100 g portion. Foods in ``exclude`` are
+        skipped.
+        """
+        exclude = set(exclude)
+        column = None
+        if gap is not None and label in NUTRIENTS:
+            column = self.catalog.column(label)
+        found = []
+        for row in self.ranked.get(label, ()):
+            food = self.catalog.names[row]
+            if food in exclude:
+                continue
+            grams = 100
+            if column is not None:
+                grams = gap / float(column[row]) * 100
+                grams = int(min(np.ceil(grams / 5) * 5, self.max_grams))
+            found.append((food, grams))
+            if len(found) == limit:
+                break
+        return found
@@ -0,0 +1,215 @@
+import numpy as np
+
+GENDERS = ("Male", "Female", "Other")
+
+# Revised Harris-Benedict: intercept, per kg, per cm, per year of age.
+# "Other" averages the two equations.
+_BMR_COEFFICIENTS = np.array(
+    [
+        [88.362, 13.397, 4.799, -5.677],
+        [447.593, 9.247, 3.098, -4.330],
+        [0.0, 0.0, 0.0, 0.0],
+    ]
+)
+_BMR_COEFFICIENTS[2] = _BMR_COEFFICIENTS[:2].mean(axis=0)
+
+ACTIVITY_FACTORS = {
+    "Sedentary": 1.2,
+    "Lightly Active": 1.375,
+    "Moderately Active": 1.55,
+    "Very Active": 1.725,
+    "Extra Active": 1.9,
+}
+ACTIVITY_LEVELS = tuple(ACTIVITY_FACTORS)
+_FACTORS = np.array(list(ACTIVITY_FACTORS.values()))
+
+# DataFrame column -> energy_targets argument
+PERSON_COLUMNS = {
+    "Age": "age",
+    "Gender": "gender",
+    "Weight": "weight",
+    "Height": "height",
+    "Activity Level": "activity_level",
+}
+
+
+def label_codes(values, labels):
+    # Positions of values in labels, -1 where missing; integer input passes
+    # through as already-encoded codes
+    if np.ndim(values) == 0:
+        if isinstance(values, (int, np.integer)):
+            return np.asarray(values)
+        return np.asarray(labels.index(values) if values in labels else -1)
+
+    # Only the array paths need pandas; importing it here keeps the scalar
+    # functions light enough for the Home page
+    import pandas as pd
+
+    if not isinstance(values, pd.Series):
+        values = np.asarray(values)
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return np.asarray(values)
+    # Factorize first so only the few distinct labels are looked up
+    codes, uniques = pd.factorize(values if values.ndim == 1 else values.ravel())
+    lookup = np.array([labels.index(u) if u in labels else -1 for u in uniques] + [-1])
+    return lookup[codes].reshape(values.shape)
+
+
+def bmr_array(age, gender, weight, height):
+    """Basal metabolic rate in kcal/day for arrays of people.
+
+    ``gender`` holds labels from GENDERS or their integer codes; anything
+    else is treated as "Other". Inputs broadcast against each other.
+    """
+    codes = label_codes(gender, GENDERS)
+    coefficients = _BMR_COEFFICIENTS[np.where(codes < 0, 2, codes)]
+    return (
+        coefficients[..., 0]
+        + coefficients[..., 1] * np.asarray(weight, dtype=np.float64)
+        + coefficients[..., 2] * np.asarray(height, dtype=np.float64)
+        + coefficients[..., 3] * np.asarray(age, dtype=np.float64)
+    )
+
+
+def tdee_array(bmr, activity_level):
+    """Total daily energy expenditure: BMR times the activity factor.
+
+    ``activity_level`` holds ACTIVITY_LEVELS labels or their integer codes.
+    Raises KeyError for unknown levels.
+    """
+    codes = label_codes(activity_level, ACTIVITY_LEVELS)
+    unknown = codes < 0
+    if np.any(unknown):
+        raise KeyError(sorted(set(np.asarray(activity_level)[unknown].tolist())))
+    return np.asarray(bmr, dtype=np.float64) * _FACTORS[codes]
+
+
+def energy_targets(people, columns=PERSON_COLUMNS):
+    # BMR and TDEE for every row of a DataFrame with the columns keys
+    import pandas as pd
+
+    args = {argument: people[column] for column, argument in columns.items()}
+    bmr = bmr_array(args["age"], args["gender"], args["weight"], args["height"])
+    tdee = tdee_array(bmr, args["activity_level"])
+    return pd.DataFrame({"BMR": bmr, "TDEE": tdee}, index=people.index)
+
+
+def calculate_bmr(age, gender, weight, height):
+    return float(bmr_array(age, gender, weight, height))
+
+
+def calculate_tdee(bmr, activity_level):
+    return float(tdee_array(bmr, activity_level))
+
+
+KCAL_PER_KG = 7700  # Energy stored in a kilogram of body weight change
+
+
+class TdeeEstimator:
+    """Adaptive estimate of TDEE from daily energy balance, for many users.
+
+    A scalar Kalman filter per user, stepped once per day in O(1). The state
+    is the user's TDEE with its variance. Two observations can arrive on a
+    day, and a missing one (NaN) is skipped:
+
+    - ``burned``, tracker expenditure, observes TDEE directly;
+    - at a weigh-in, mean logged ``intake`` since the previous weigh-in minus
+      the change in smoothed weight (an EMA with ``weight_alpha`` per day)
+      converted at KCAL_PER_KG. Its variance shrinks with the days it spans.
+
+    ``process_var`` lets the estimate follow real changes in expenditure.
+    All state is arrays of one entry per user, so a nightly run steps every
+    user at once.
+    """
+
+    def __init__(
+        self,
+        initial_tdee,
+        initial_var=400.0**2,
+        process_var=15.0**2,
+        tracker_var=300.0**2,
+        balance_var=1000.0**2,
+        weight_alpha=0.2,
+    ):
+        self.tdee = np.array(initial_tdee, dtype=np.float64, ndmin=1)
+        self.var = np.full(self.tdee.shape, float(initial_var))
+        self.process_var = process_var
+        self.tracker_var = tracker_var
+        self.balance_var = balance_var
+        self.weight_alpha = weight_alpha
+        self.weight_trend = np.full(self.tdee.shape, np.nan)
+        self._days_since_weight = np.zeros(self.tdee.shape)
+        self._intake_sum = np.zeros(self.tdee.shape)
+        self._intake_days = np.zeros(self.tdee.shape)
+
+    def _observe(self, value, variance):
+        seen = ~np.isnan(value)
+        gain = np.where(seen, self.var / (self.var + variance), 0.0)
+        self.tdee = np.where(seen, self.tdee + gain * (value - self.tdee), self.tdee)
+        self.var = (1 - gain) * self.var
+
+    def update(self, intake=np.nan, burned=np.nan, weight=np.nan):
+        # Step every user by one day and return the TDEE estimates
+        shape = self.tdee.shape
+        intake = np.broadcast_to(np.asarray(intake, dtype=np.float64), shape)
+        burned = np.broadcast_to(np.asarray(burned, dtype=np.float64), shape)
+        weight = np.broadcast_to(np.asarray(weight, dtype=np.float64), shape)
+
+        self.var = self.var + self.process_var
+        self._observe(burned, self.tracker_var)
+
+        logged = ~np.isnan(intake)
+        self._intake_sum += np.where(logged, intake, 0.0)
+        self._intake_days += logged
+        self._days_since_weight += 1
+
+        weighed = ~np.isnan(weight)
+        gap = self._days_since_weight
+        alpha = 1 - (1 - self.weight_alpha) ** gap
+        trend = np.where(
+            np.isnan(self.weight_trend),
+            weight,
+            self.weight_trend + alpha * (weight - self.weight_trend),
+        )
+        balanced = weighed & ~np.isnan(self.weight_trend) & (self._intake_days > 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            balance = (
+                self._intake_sum / self._intake_days
+                - KCAL_PER_KG * (trend - self.weight_trend) / gap
+            )
+        self._observe(np.where(balanced, balance, np.nan), self.balance_var / gap)
+
+        self.weight_trend = np.where(weighed, trend, self.weight_trend)
+        self._days_since_weight[weighed] = 0
+        self._intake_sum[weighed] = 0
+        self._intake_days[weighed] = 0
+        return self.tdee
+
+    _STATE = (
+        "tdee",
+        "var",
+        "weight_trend",
+        "_days_since_weight",
+        "_intake_sum",
+        "_intake_days",
+    )
+
+    def state(self):
+        # Filter state as plain lists, to persist it between sessions
+        return {name.lstrip("_"): getattr(self, name).tolist() for name in self._STATE}
+
+    @classmethod
+    def from_state(cls, state, **options):
+        estimator = cls(state["tdee"], **options)
+        for name in cls._STATE:
+            setattr(
+                estimator, name, np.array(state[name.lstrip("_")], dtype=np.float64)
+            )
+        return estimator
+
+    def run(self, intake, burned, weight):
+        # Step through (days, users) arrays, returning each day's estimates
+        intake, burned, weight = np.broadcast_arrays(
+            *(np.asarray(a, dtype=np.float64) for a in (intake, burned, weight))
+        )
+        return np.array([self.update(*day) for day in zip(intake, burned, weight)])
@@ -0,0 +1,196 @@
+import sys
+
+import numpy as np
+
+# Nutrient columns, in the order they are stored and reported (values per 100g)
+NUTRIENTS = (
+    "calories",
+    "protein",
+    "carbs",
+    "fat",
+    "fiber",
+    "sugar",
+    "sodium",
+    "potassium",
+)
+MACROS = ("calories", "protein", "carbs", "fat")
+
+
+class FoodCatalog:
+    """Columnar food catalog.
+
+    Nutrients are stored as a (len(NUTRIENTS), n_foods) float32 matrix so each
+    nutrient column is contiguous in memory. Vitamins and diet tags (vegan,
+    vegetarian, ...) are kept out of the matrix as uint32 bitmasks per food,
+    one bit per entry in ``vitamins`` and ``tags`` respectively.
+    """
+
+    def __init__(
+        self,
+        names,
+        matrix,
+        vitamin_masks,
+        vitamins,
+        tag_masks=None,
+        tags=(),
+        index=None,
+    ):
+        if index is None:
+            self.names = [sys.intern(name) for name in names]
+            self.index = {name: row for row, name in enumerate(self.names)}
+        else:
+            # Name -> row lookup supplied with the names, e.g. by a snapshot
+            self.names, self.index = names, index
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        self.vitamin_masks = np.asarray(vitamin_masks, dtype=np.uint32)
+        self.vitamins = tuple(vitamins)
+        if tag_masks is None:
+            tag_masks = np.zeros(len(self.names), dtype=np.uint32)
+        self.tag_masks = np.asarray(tag_masks, dtype=np.uint32)
+        self.tags = tuple(tags)
+        self._nutrient_index = {n: i for i, n in enumerate(NUTRIENTS)}
+
+    @classmethod
+    def from_dict(cls, database):
+        names = list(database.keys())
+        matrix = np.zeros((len(NUTRIENTS), len(names)), dtype=np.float32)
+        for row, name in enumerate(names):
+            matrix[:, row] = [database[name].get(n, 0) for n in NUTRIENTS]
+        vitamins, vitamin_masks = _bitmasks(database, "vitamins")
+        tags, tag_masks = _bitmasks(database, "tags")
+        return cls(names, matrix, vitamin_masks, vitamins, tag_masks, tags)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def row(self, name):
+        return self.index[name]
+
+    def rows(self, names):
+        return np.fromiter((self.index[n] for n in names), dtype=np.intp)
+
+    def column(self, nutrient):
+        return self.matrix[self._nutrient_index[nutrient]]
+
+    def columns(self, rows):
+        # Nutrients of the given rows, shape (len(NUTRIENTS), len(rows))
+        return self.matrix[:, rows]
+
+    def column_at(self, i, rows):
+        # Nutrient i (a position in NUTRIENTS) of the given rows
+        return self.matrix[i, rows]
+
+    def vitamin_masks_at(self, rows):
+        return self.vitamin_masks[rows]
+
+    def nutrient_rows(self, nutrients):
+        return [self._nutrient_index[n] for n in nutrients]
+
+    def scale(self, rows, grams):
+        # Per-item nutrients for the given amounts, shape (len(rows), len(NUTRIENTS))
+        rows = np.asarray(rows, dtype=np.intp)
+        factors = np.asarray(grams, dtype=np.float64) / 100
+        return self.matrix[:, rows].T * factors[:, None]
+
+    def totals(self, rows, grams):
+        # Summed nutrients for the given amounts as one matrix-vector product
+        rows = np.asarray(rows, dtype=np.intp)
+        factors = np.asarray(grams, dtype=np.float64) / 100
+        return self.matrix[:, rows] @ factors
+
+    def nutrients(self, row):
+        return dict(zip(NUTRIENTS, self.matrix[:, row].tolist()))
+
+    def vitamin_names(self, row):
+        mask = int(self.vitamin_masks[row])
+        return [v for i, v in enumerate(self.vitamins) if mask >> i & 1]
+
+    def with_tag(self, tag):
+        # Rows of every food carrying the given tag
+        if tag not in self.tags:
+            return np.empty(0, dtype=np.intp)
+        bit = np.uint32(1 << self.tags.index(tag))
+        return np.flatnonzero(self.tag_masks & bit)
+
+
+class CatalogOverlay:
+    """A shared FoodCatalog plus a few rows of its own, numbered after it.
+
+    Names and rows resolve against the shared catalog first, then the
+    overlay, so the shared arrays are never copied; only the extra rows are
+    stored. Used for a user's recipes on top of the process-wide catalog.
+    """
+
+    def __init__(self, base, names, matrix, vitamin_masks, tag_masks):
+        self.base = base
+        self.offset = len(base)
+        self.names = [sys.intern(name) for name in names]
+        self.index = {name: row for row, name in enumerate(self.names)}
+        self.matrix = np.array(matrix, dtype=np.float32).reshape(len(NUTRIENTS), -1)
+        self.vitamin_masks = np.array(vitamin_masks, dtype=np.uint32)
+        self.tag_masks = np.array(tag_masks, dtype=np.uint32)
+        self.vitamins = base.vitamins
+        self.tags = base.tags
+
+    def __len__(self):
+        return self.offset + len(self.names)
+
+    def __contains__(self, name):
+        return name in self.base or name in self.index
+
+    def row(self, name):
+        row = self.base.index.get(name)
+        if row is None:
+            return self.offset + self.index[name]
+        return row
+
+    def rows(self, names):
+        return np.fromiter((self.row(n) for n in names), dtype=np.intp)
+
+    def _split(self, rows):
+        rows = np.asarray(rows, dtype=np.intp)
+        own = rows >= self.offset
+        return rows, own
+
+    def columns(self, rows):
+        rows, own = self._split(rows)
+        out = np.empty((len(NUTRIENTS), len(rows)), dtype=np.float32)
+        out[:, ~own] = self.base.columns(rows[~own])
+        out[:, own] = self.matrix[:, rows[own] - self.offset]
+        return out
+
+    def column_at(self, i, rows):
+        rows, own = self._split(rows)
+        out = np.empty(len(rows), dtype=np.float32)
+        out[~own] = self.base.column_at(i, rows[~own])
+        out[own] = self.matrix[i, rows[own] - self.offset]
+        return out
+
+    def vitamin_masks_at(self, rows):
+        rows, own = self._split(rows)
+        out = np.empty(len(rows), dtype=np.uint32)
+        out[~own] = self.base.vitamin_masks_at(rows[~own])
+        out[own] = self.vitamin_masks[rows[own] - self.offset]
+        return out
+
+    def update(self, name, nutrients, vitamin_mask, tag_mask):
+        # Replace the values of one of the overlay's own rows
+        row = self.index[name]
+        self.matrix[:, row] = nutrients
+        self.vitamin_masks[row] = vitamin_mask
+        self.tag_masks[row] = tag_mask
+
+
+def _bitmasks(database, field):
+    labels = sorted({v for food in database.values() for v in food.get(field, [])})
+    if len(labels) > 32:
+        raise ValueError(f"FoodCatalog supports at most 32 distinct {field}")
+    bits = {v: 1 << i for i, v in enumerate(labels)}
+    masks = np.zeros(len(database), dtype=np.uint32)
+    for row, food in enumerate(database.values()):
+        for v in food.get(field, []):
+            masks[row] |= bits[v]
+    return labels, masks
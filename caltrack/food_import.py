@@ -0,0 +1,371 @@
+"""Streaming import of food composition dumps into a catalog snapshot.
+
+Reads CSV (optionally compressed), JSON Lines or JSON files holding one
+array of foods, such as USDA FoodData Central downloads, in chunks so
+memory stays bounded by the chunk size plus 16 bytes per imported food
+(the dedup keys and the snapshot's name hashes).
+Columns are matched by name: nutrient headers like ``Protein (G)``,
+``protein_g`` or ``Sodium, Na (MG)`` are converted to the catalog's units
+per 100 g, and FoodData Central ``foodNutrients`` lists are flattened the
+same way. Foods are deduplicated by their catalog name, "name (brand)",
+ignoring case and spacing; the first one wins.
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .food_catalog import NUTRIENTS
+from .food_snapshot import SnapshotWriter, name_hash
+
+# Vitamin and diet tag labels of imported catalogs, in bit order
+VITAMINS = ("A", "B1", "B2", "B3", "B5", "B6", "B7", "B9", "B12", "C", "D", "E", "K")
+TAGS = ("vegan", "vegetarian")
+
+# Unit each nutrient is stored in, and header names it is imported from
+NUTRIENT_UNITS = {n: "g" for n in NUTRIENTS}
+NUTRIENT_UNITS.update(calories="kcal", sodium="mg", potassium="mg")
+NUTRIENT_ALIASES = {
+    "calories": ("calories", "energy", "kcal", "energy kcal"),
+    "protein": ("protein", "proteins"),
+    "carbs": ("carbs", "carbohydrate", "carbohydrates", "total carbohydrate"),
+    "fat": ("fat", "total fat", "total lipid (fat)", "total lipid"),
+    "fiber": ("fiber", "fibre", "dietary fiber", "total dietary fiber"),
+    "sugar": ("sugar", "sugars", "total sugars"),
+    "sodium": ("sodium",),
+    "potassium": ("potassium",),
+}
+FIELD_ALIASES = {
+    "name": ("name", "description", "food", "food name", "product name"),
+    "brand": ("brand", "brands", "brand name", "brand owner"),
+    "serving_size": ("serving size", "portion grams"),
+    "serving_unit": ("serving size unit", "serving unit"),
+    "vitamins": ("vitamins",),
+    "tags": ("tags", "labels"),
+    "vegan": ("vegan",),
+    "vegetarian": ("vegetarian",),
+}
+VITAMIN_ALIASES = {
+    "retinol": "A",
+    "thiamin": "B1",
+    "thiamine": "B1",
+    "riboflavin": "B2",
+    "niacin": "B3",
+    "pantothenic acid": "B5",
+    "biotin": "B7",
+    "folate": "B9",
+    "folic acid": "B9",
+    "cobalamin": "B12",
+    "ascorbic acid": "C",
+}
+
+MASS_UNITS = {"g": 1.0, "mg": 1e-3, "ug": 1e-6, "mcg": 1e-6, "µg": 1e-6}
+ENERGY_UNITS = {"kcal": 1.0, "kj": 1 / 4.184}
+# Serving units in grams; millilitres are taken as grams
+SERVING_UNITS = {"g": 1.0, "grm": 1.0, "ml": 1.0, "mlt": 1.0, "oz": 28.3495}
+SERVING_UNITS.update(kg=1000.0, lb=453.592)
+
+ImportStats = namedtuple("ImportStats", ["read", "imported", "duplicates", "skipped"])
+
+_UNIT_PATTERN = re.compile(r"^(.*?)[\s_(]+(kcal|kj|mg|mcg|ug|µg|g)\)?$")
+
+
+def _normalize(text):
+    return " ".join(str(text).lower().replace("_", " ").split())
+
+
+def _parse_header(column):
+    # (base name, unit) of a header such as "Protein (G)", "sodium_mg" or
+    # "servingSizeUnit"
+    text = _normalize(re.sub(r"(?<=[a-z])(?=[A-Z][a-z])", " ", str(column)))
+    match = _UNIT_PATTERN.match(text)
+    if match:
+        return match.group(1).strip(" ,"), match.group(2)
+    return text, None
+
+
+def _vitamin_label(text):
+    # Canonical label of "B12", "Vitamin B-12", "vitamin_c_mg", "Thiamin", ...
+    text = re.sub(r"\(.*?\)", "", _parse_header(text)[0]).split(",")[0].strip()
+    if text in VITAMIN_ALIASES:
+        return VITAMIN_ALIASES[text]
+    text = text.removeprefix("vitamin").replace("-", "").replace(" ", "").upper()
+    return text if text in VITAMINS else None
+
+
+def _resolve(columns):
+    """Which column feeds each field, nutrient and vitamin, with unit factors."""
+    spec = {"nutrients": {}, "vitamin_columns": []}
+    for column in columns:
+        base, unit = _parse_header(column)
+        short = base.split(",")[0].strip()
+        for field, aliases in FIELD_ALIASES.items():
+            if base in aliases and field not in spec:
+                spec[field] = column
+        for nutrient, aliases in NUTRIENT_ALIASES.items():
+            if nutrient in spec["nutrients"] or not (
+                base in aliases or short in aliases
+            ):
+                continue
+            factor = _unit_factor(nutrient, unit)
+            if factor is not None:
+                spec["nutrients"][nutrient] = (column, factor)
+        if short.startswith("vitamin ") or short in VITAMIN_ALIASES:
+            label = _vitamin_label(base)
+            if label is not None:
+                spec["vitamin_columns"].append((column, label))
+    return spec
+
+
+def _unit_factor(nutrient, unit):
+    # Factor converting a value in unit to the nutrient's unit, None if unknown
+    target = NUTRIENT_UNITS[nutrient]
+    if unit is None:
+        return 1.0
+    if target == "kcal":
+        return ENERGY_UNITS.get(unit)
+    if unit not in MASS_UNITS:
+        return None
+    return MASS_UNITS[unit] / MASS_UNITS[target]
+
+
+def _labels(values, parse, labels):
+    # Bitmasks from list-like cells ("A, C", ["A", "C"]) of label names
+    masks = np.zeros(len(values), dtype=np.uint32)
+    for row, value in enumerate(values):
+        if isinstance(value, str):
+            value = re.split(r"[,;|]", value)
+        elif not isinstance(value, (list, tuple)):
+            continue
+        for item in value:
+            label = parse(str(item))
+            if label in labels:
+                masks[row] |= 1 << labels.index(label)
+    return masks
+
+
+def _truthy(values):
+    text = pd.Series(values).astype("string").str.strip().str.lower()
+    return text.isin(["1", "true", "yes", "y"]).to_numpy()
+
+
+def _flatten(record):
+    # FoodData Central records list nutrients as {"nutrient": {...}, "amount"}
+    nutrients = record.pop("foodNutrients", None)
+    for item in nutrients or ():
+        nutrient = item.get("nutrient", item)
+        name = nutrient.get("name") or item.get("nutrientName")
+        unit = nutrient.get("unitName") or item.get("unitName")
+        amount = item.get("amount", item.get("value"))
+        if name is not None and amount is not None:
+            record[f"{name} ({unit})" if unit else name] = amount
+    return record
+
+
+def _open_text(path):
+    opener = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}.get(
+        path[path.rfind(".") :], open
+    )
+    return opener(path, "rt", encoding="utf-8")
+
+
+def _json_array(f, block_size=1 << 20):
+    # Elements of the first JSON array in a file, decoded one at a time; the
+    # buffer holds at most one block plus the element being read
+    decoder = json.JSONDecoder()
+    buffer = ""
+    while "[" not in buffer:
+        block = f.read(block_size)
+        if not block:
+            return
+        buffer += block
+    buffer, pos = buffer[buffer.index("[") + 1 :], 0
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            record, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Element cut off at the end of the buffer: read on
+            block = f.read(block_size)
+            if not block:
+                if buffer[pos:].strip():
+                    raise ValueError("Truncated JSON array") from None
+                return
+            buffer, pos = buffer[pos:] + block, 0
+            continue
+        yield record
+
+
+def read_chunks(path, chunk_size=50_000):
+    """DataFrames of at most chunk_size raw records from a CSV or JSON file."""
+    name = path.lower().removesuffix(".gz").removesuffix(".bz2").removesuffix(".xz")
+    if name.endswith((".csv", ".tsv", ".txt")):
+        sep = "\t" if name.endswith(".tsv") else ","
+        yield from pd.read_csv(
+            path, sep=sep, chunksize=chunk_size, dtype=str, keep_default_na=False
+        )
+        return
+    if not name.endswith((".json", ".jsonl", ".ndjson")):
+        raise ValueError(f"Unsupported food file {path}: expected CSV or JSON")
+
+    with _open_text(path) as f:
+        if name.endswith(".json"):
+            records = _json_array(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        chunk = []
+        for record in records:
+            chunk.append(_flatten(record))
+            if len(chunk) == chunk_size:
+                yield pd.DataFrame(chunk)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk)
+
+
+def normalize_chunk(frame, per_serving=False):
+    """Names, brands, nutrients per 100 g and label masks of a raw chunk.
+
+    Returns (names, brands, nutrients, vitamin_masks, tag_masks) for the rows
+    that have a name and at least one known nutrient (and a serving size in
+    grams when ``per_serving``), plus the number of rows dropped.
+    """
+    spec = _resolve(frame.columns)
+    if "name" not in spec or not spec["nutrients"]:
+        return None, len(frame)
+    size = len(frame)
+
+    def text(field):
+        if field not in spec:
+            return pd.Series([""] * size, dtype="string")
+        return frame[spec[field]].astype("string").fillna("").str.strip()
+
+    names, brands = text("name"), text("brand")
+    values = np.full((size, len(NUTRIENTS)), np.nan)
+    for i, nutrient in enumerate(NUTRIENTS):
+        if nutrient in spec["nutrients"]:
+            column, factor = spec["nutrients"][nutrient]
+            numbers = pd.to_numeric(frame[column], errors="coerce")
+            values[:, i] = numbers.to_numpy(dtype=np.float64) * factor
+    keep = (names != "").to_numpy() & ~np.isnan(values).all(axis=1)
+
+    # Calories from the macros when only those are listed
+    protein, carbs, fat = np.nan_to_num(values[:, 1:4]).T
+    calories = 4 * protein + 4 * carbs + 9 * fat
+    values[:, 0] = np.where(np.isnan(values[:, 0]), calories, values[:, 0])
+    values = np.nan_to_num(values)
+
+    if per_serving:
+        amount = pd.to_numeric(text("serving_size"), errors="coerce").to_numpy()
+        unit = text("serving_unit").str.lower().replace("", "g")
+        grams = amount * unit.map(SERVING_UNITS).astype(float).to_numpy()
+        keep &= grams > 0
+        values *= 100 / np.where(grams > 0, grams, 1)[:, None]
+    keep &= np.all(values >= 0, axis=1)
+
+    vitamins = np.zeros(size, dtype=np.uint32)
+    if "vitamins" in spec:
+        vitamins |= _labels(frame[spec["vitamins"]], _vitamin_label, VITAMINS)
+    for column, label in spec["vitamin_columns"]:
+        present = pd.to_numeric(frame[column], errors="coerce").to_numpy() > 0
+        vitamins |= present.astype(np.uint32) << VITAMINS.index(label)
+
+    tags = np.zeros(size, dtype=np.uint32)
+    if "tags" in spec:
+        tags |= _labels(frame[spec["tags"]], _normalize, TAGS)
+    vegan = (tags & 1).astype(bool)
+    if "vegan" in spec:
+        vegan |= _truthy(frame[spec["vegan"]])
+    vegetarian = vegan | (tags & 2).astype(bool)
+    if "vegetarian" in spec:
+        vegetarian |= _truthy(frame[spec["vegetarian"]])
+    tags = vegan.astype(np.uint32) | vegetarian.astype(np.uint32) << 1
+
+    rows = np.flatnonzero(keep)
+    normalized = (
+        names.to_numpy(dtype=object)[rows],
+        brands.to_numpy(dtype=object)[rows],
+        values[rows],
+        vitamins[rows],
+        tags[rows],
+    )
+    return normalized, size - len(rows)
+
+
+def display_name(name, brand):
+    return f"{name} ({brand})" if brand else name
+
+
+def import_foods(paths, out, chunk_size=50_000, per_serving=False, progress=None):
+    """Import food files into a snapshot directory; returns ImportStats.
+
+    ``paths`` may also hold DataFrames, e.g. the built-in foods, always read
+    as per 100 g. Only the 64-bit hashes of the normalized catalog names
+    seen so far are kept between chunks, in one sorted array. ``progress``
+    is called with the running stats after each chunk.
+    """
+    writer = SnapshotWriter(out, VITAMINS, TAGS)
+    seen = np.empty(0, dtype=np.uint64)
+    read = imported = duplicates = skipped = 0
+    for path in paths:
+        if isinstance(path, pd.DataFrame):
+            chunks, serving = [path], False
+        else:
+            chunks, serving = read_chunks(path, chunk_size), per_serving
+        for frame in chunks:
+            read += len(frame)
+            normalized, dropped = normalize_chunk(frame, serving)
+            skipped += dropped
+            if normalized is None:
+                continue
+            names, brands, values, vitamins, tags = normalized
+
+            # Keyed on the name the catalog looks foods up by, so "Oats" by
+            # Quaker and an unbranded "Oats (Quaker)" are one food
+            display = [display_name(n, b) for n, b in zip(names, brands)]
+            keys = np.fromiter(
+                (name_hash(_normalize(name)) for name in display),
+                dtype=np.uint64,
+                count=len(display),
+            )
+            # First of each key in the chunk, unless an earlier chunk had it
+            _, first = np.unique(keys, return_index=True)
+            first.sort()
+            position = np.searchsorted(seen, keys[first])
+            found = position < len(seen)
+            found[found] = seen[position[found]] == keys[first][found]
+            new = first[~found]
+            duplicates += len(names) - len(new)
+
+            writer.write(
+                [display[i] for i in new],
+                values[new],
+                vitamins[new],
+                tags[new],
+            )
+            added = np.sort(keys[new])
+            seen = np.insert(seen, np.searchsorted(seen, added), added)
+            imported += len(new)
+            if progress is not None:
+                progress(ImportStats(read, imported, duplicates, skipped))
+    writer.close()
+    return ImportStats(read, imported, duplicates, skipped)
+
+
+def database_frame(database):
+    # Built-in FOOD_DATABASE entries as an import chunk
+    return pd.DataFrame(
+        [
+            {"name": name, **{n: food.get(n, 0) for n in NUTRIENTS}, **food}
+            for name, food in database.items()
+        ]
+    )
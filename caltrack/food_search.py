@@ -0,0 +1,137 @@
+from bisect import bisect_left
+
+import numpy as np
+
+
+def _normalize(text):
+    return " ".join(text.lower().split())
+
+
+def _trigram_codes(texts):
+    # Every byte trigram of each padded text, packed into an int64 code,
+    # together with the index of the text it came from
+    encoded = [f"  {text} ".encode() for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.intp, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.int64)
+    owner = np.repeat(np.arange(len(encoded)), lengths)
+    ends = np.cumsum(lengths)
+
+    positions = np.arange(max(len(data) - 2, 0))
+    positions = positions[positions + 2 < ends[owner[positions]]]
+    codes = data[positions] << 16 | data[positions + 1] << 8 | data[positions + 2]
+    return codes, owner[positions]
+
+
+def _run_starts(values):
+    # Mask of the first element of each run of equal values in a sorted array
+    starts = np.ones(len(values), dtype=bool)
+    starts[1:] = values[1:] != values[:-1]
+    return starts
+
+
+class FoodSearchIndex:
+    """Prefix and fuzzy search over catalog names, built once per catalog.
+
+    Prefix matches bisect two sorted key lists: the full names, then every
+    later word-suffix ("brown rice" is also indexed as "rice"). Remaining
+    slots are filled by trigram similarity from an inverted index stored as
+    sorted trigram codes with CSR-style row postings.
+    """
+
+    def __init__(self, names, stop_fraction=0.02):
+        self.names = list(names)
+        normalized = [_normalize(name) for name in self.names]
+
+        full = sorted((text, row) for row, text in enumerate(normalized))
+        self.full_keys = [text for text, _ in full]
+        self.full_rows = [row for _, row in full]
+        words = sorted(
+            (" ".join(parts[i:]), row)
+            for row, parts in enumerate(text.split(" ") for text in normalized)
+            for i in range(1, len(parts))
+        )
+        self.word_keys = [text for text, _ in words]
+        self.word_rows = [row for _, row in words]
+
+        codes, rows = _trigram_codes(normalized)
+        pairs = np.sort(codes << 32 | rows)
+        pairs = pairs[_run_starts(pairs)]
+        codes, rows = pairs >> 32, (pairs & 0xFFFFFFFF).astype(np.int32)
+        starts = np.flatnonzero(_run_starts(codes))
+        self.trigram_codes = codes[starts]
+        self.trigram_offsets = np.append(starts, len(rows))
+        self.trigram_rows = rows
+        self.trigram_counts = np.bincount(rows, minlength=len(self.names))
+        # Trigrams shared by more rows than this barely narrow the candidates
+        # down, so they are only used when a query has too few rarer ones
+        self.max_posting = max(64, int(len(self.names) * stop_fraction))
+        self.min_trigrams = 3
+        # Fallback postings are unioned only up to this many rows in total;
+        # past it, a query gets its prefix matches alone
+        self.max_union = 2 * self.max_posting
+
+    def _range(self, keys, rows, query):
+        start = bisect_left(keys, query)
+        end = bisect_left(keys, query + "\uffff")
+        return rows[start:end]
+
+    def prefix(self, query, limit=20):
+        # Whole-name matches first, then names with a later word matching
+        query = _normalize(query)
+        rows = dict.fromkeys(self._range(self.full_keys, self.full_rows, query)[:limit])
+        for row in self._range(self.word_keys, self.word_rows, query):
+            if len(rows) >= limit:
+                break
+            rows.setdefault(row)
+        return list(rows)
+
+    def fuzzy(self, query, limit=20, min_score=0.2):
+        codes = np.unique(_trigram_codes([_normalize(query)])[0])
+        if len(self.trigram_codes) == 0:
+            return []
+        found = np.searchsorted(self.trigram_codes, codes)
+        found = np.minimum(found, len(self.trigram_codes) - 1)
+        found = found[self.trigram_codes[found] == codes]
+        if len(found) == 0:
+            return []
+
+        sizes = self.trigram_offsets[found + 1] - self.trigram_offsets[found]
+        used = found[sizes <= self.max_posting]
+        if len(used) < self.min_trigrams:
+            smallest = np.argsort(sizes, kind="stable")[: self.min_trigrams]
+            if sizes[smallest].sum() > self.max_union:
+                return []
+            used = found[smallest]
+        candidates, shared = np.unique(
+            np.concatenate(
+                [
+                    self.trigram_rows[
+                        self.trigram_offsets[i] : self.trigram_offsets[i + 1]
+                    ]
+                    for i in used
+                ]
+            ),
+            return_counts=True,
+        )
+        # Jaccard similarity over the trigrams that were looked up
+        score = shared / (len(used) + self.trigram_counts[candidates] - shared)
+
+        keep = score >= min_score * len(used) / len(codes)
+        candidates, score = candidates[keep], score[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(-score, limit - 1)[:limit]
+            candidates, score = candidates[top], score[top]
+        return candidates[np.lexsort((candidates, -score))].tolist()
+
+    def search(self, query, limit=20):
+        # Row numbers of the best matches: prefix matches first, then fuzzy
+        if not query.strip():
+            return self.full_rows[:limit]
+        rows = self.prefix(query, limit)
+        if len(rows) < limit:
+            seen = set(rows)
+            rows += [r for r in self.fuzzy(query, limit) if r not in seen]
+        return rows[:limit]
+
+    def search_names(self, query, limit=20):
+        return [self.names[row] for row in self.search(query, limit)]
@@ -0,0 +1,200 @@
+"""Binary food catalog snapshots, loaded with memory mapping.
+
+A snapshot is a directory of raw little-endian arrays plus a manifest:
+
+- ``manifest.json``: format, row count, nutrient, vitamin and tag labels
+- ``nutrients.f32``: float32 (len(NUTRIENTS), rows), per 100 g
+- ``vitamins.u4``, ``tags.u4``: uint32 bitmasks per row
+- ``names.bin``, ``names.u8``: UTF-8 names and their uint64 offsets
+- ``hashes.u8``, ``hash_rows.u4``: sorted 64-bit name hashes and their rows
+
+Loading maps the files instead of reading them, so opening a catalog of
+millions of foods costs a few milliseconds; pages are read on first use.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from .food_catalog import NUTRIENTS, FoodCatalog
+
+FORMAT = 1
+
+
+def name_hash(name):
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class NameTable:
+    """Sequence of the names in a snapshot, decoded on access.
+
+    ``index`` maps a name to its row like the dict a FoodCatalog builds,
+    by binary search over the sorted name hashes.
+    """
+
+    def __init__(self, blob, offsets, hashes, hash_rows):
+        self.blob = blob
+        self.offsets = offsets
+        self.hashes = hashes
+        self.hash_rows = hash_rows
+        self.index = _NameIndex(self)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return bytes(self.blob[start:end]).decode()
+
+    def __iter__(self):
+        # Read in blocks, so a full pass doesn't touch the map per name
+        for first in range(0, len(self), 65_536):
+            last = min(first + 65_536, len(self))
+            offsets = self.offsets[first : last + 1].tolist()
+            block = bytes(self.blob[offsets[0] : offsets[-1]])
+            base = offsets[0]
+            for start, end in zip(offsets, offsets[1:]):
+                yield block[start - base : end - base].decode()
+
+
+class _NameIndex:
+    def __init__(self, names):
+        self.names = names
+
+    def get(self, name, default=None):
+        hashes = self.names.hashes
+        key = np.uint64(name_hash(name))
+        i = int(np.searchsorted(hashes, key))
+        while i < len(hashes) and hashes[i] == key:
+            row = int(self.names.hash_rows[i])
+            if self.names[row] == name:
+                return row
+            i += 1
+        return default
+
+    def __getitem__(self, name):
+        row = self.get(name)
+        if row is None:
+            raise KeyError(name)
+        return row
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+
+def _map(path, name, dtype, shape=None):
+    path = os.path.join(path, name)
+    if os.path.getsize(path) == 0:
+        return np.zeros(shape or 0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+def load_catalog(path):
+    """FoodCatalog backed by the snapshot in directory ``path``."""
+    with open(os.path.join(path, "manifest.json")) as f:
+        manifest = json.load(f)
+    if manifest["format"] != FORMAT or manifest["nutrients"] != list(NUTRIENTS):
+        raise ValueError(f"Unsupported food snapshot in {path}")
+    rows = manifest["rows"]
+    names = NameTable(
+        _map(path, "names.bin", np.uint8),
+        _map(path, "names.u8", "<u8", (rows + 1,)),
+        _map(path, "hashes.u8", "<u8", (rows,)),
+        _map(path, "hash_rows.u4", "<u4", (rows,)),
+    )
+    return FoodCatalog(
+        names,
+        _map(path, "nutrients.f32", "<f4", (len(NUTRIENTS), rows)),
+        _map(path, "vitamins.u4", "<u4", (rows,)),
+        manifest["vitamins"],
+        _map(path, "tags.u4", "<u4", (rows,)),
+        manifest["tags"],
+        index=names.index,
+    )
+
+
+class SnapshotWriter:
+    """Writes a snapshot chunk by chunk, holding only the name hashes.
+
+    Nutrients arrive row by row but are stored nutrient by nutrient, so each
+    nutrient goes to its own temporary file, concatenated on ``close``. The
+    snapshot is written to a temporary directory and moved into place at
+    the end, so readers never see a partial one.
+    """
+
+    def __init__(self, path, vitamins, tags):
+        self.path = path
+        self.tmp = path.rstrip(os.sep) + ".tmp"
+        self.vitamins = list(vitamins)
+        self.tags = list(tags)
+        self.rows = 0
+        self._offset = 0
+        self._hashes = []
+        os.makedirs(self.tmp, exist_ok=True)
+        self._files = {
+            name: open(os.path.join(self.tmp, name), "wb")
+            for name in ("names.bin", "names.u8", "vitamins.u4", "tags.u4")
+        }
+        self._nutrients = [
+            open(os.path.join(self.tmp, f"nutrient-{i}.f32"), "wb")
+            for i in range(len(NUTRIENTS))
+        ]
+        self._files["names.u8"].write(np.zeros(1, "<u8").tobytes())
+
+    def write(self, names, nutrients, vitamin_masks, tag_masks):
+        # names: list of str; nutrients: (rows, len(NUTRIENTS)) per 100 g
+        encoded = [name.encode() for name in names]
+        lengths = np.fromiter(map(len, encoded), dtype="<u8", count=len(encoded))
+        offsets = self._offset + np.cumsum(lengths, dtype="<u8")
+        self._files["names.bin"].write(b"".join(encoded))
+        self._files["names.u8"].write(offsets.tobytes())
+        self._offset = int(offsets[-1]) if len(offsets) else self._offset
+
+        columns = np.asarray(nutrients, dtype="<f4").T
+        for f, column in zip(self._nutrients, columns):
+            f.write(column.tobytes())
+        self._files["vitamins.u4"].write(np.asarray(vitamin_masks, "<u4").tobytes())
+        self._files["tags.u4"].write(np.asarray(tag_masks, "<u4").tobytes())
+        self._hashes.append(np.fromiter(map(name_hash, names), "<u8", len(names)))
+        self.rows += len(names)
+
+    def close(self):
+        for f in [*self._files.values(), *self._nutrients]:
+            f.close()
+        with open(os.path.join(self.tmp, "nutrients.f32"), "wb") as out:
+            for i in range(len(NUTRIENTS)):
+                part = os.path.join(self.tmp, f"nutrient-{i}.f32")
+                with open(part, "rb") as f:
+                    while block := f.read(1 << 24):
+                        out.write(block)
+                os.remove(part)
+
+        hashes = np.concatenate(self._hashes) if self._hashes else np.empty(0, "<u8")
+        order = np.argsort(hashes, kind="stable")
+        hashes[order].tofile(os.path.join(self.tmp, "hashes.u8"))
+        order.astype("<u4").tofile(os.path.join(self.tmp, "hash_rows.u4"))
+        manifest = {
+            "format": FORMAT,
+            "rows": self.rows,
+            "nutrients": list(NUTRIENTS),
+            "vitamins": self.vitamins,
+            "tags": self.tags,
+        }
+        with open(os.path.join(self.tmp, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.isdir(self.path):
+            old = self.path.rstrip(os.sep) + ".old"
+            os.replace(self.path, old)
+            os.replace(self.tmp, self.path)
+            shutil.rmtree(old)
+        else:
+            os.replace(self.tmp, self.path)
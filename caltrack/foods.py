@@ -0,0 +1,87 @@
+# Built-in food catalog: nutrients per 100 g
+FOOD_DATABASE = {
+    "Chicken Breast": {
+        "calories": 165,
+        "protein": 31,
+        "carbs": 0,
+        "fat": 3.6,
+        "fiber": 0,
+        "sugar": 0,
+        "sodium": 74,
+        "potassium": 256,
+        "vitamins": ["B6", "B3"],
+        "tags": [],
+    },
+    "Brown Rice": {
+        "calories": 216,
+        "protein": 5,
+        "carbs": 45,
+        "fat": 1.6,
+        "fiber": 3.5,
+        "sugar": 0.7,
+        "sodium": 10,
+        "potassium": 84,
+        "vitamins": ["B1", "B6"],
+        "tags": ["vegan", "vegetarian"],
+    },
+    "Broccoli": {
+        "calories": 55,
+        "protein": 3.7,
+        "carbs": 11.2,
+        "fat": 0.6,
+        "fiber": 5.1,
+        "sugar": 2.6,
+        "sodium": 33,
+        "potassium": 468,
+        "vitamins": ["C", "K"],
+        "tags": ["vegan", "vegetarian"],
+    },
+    "Salmon": {
+        "calories": 206,
+        "protein": 22,
+        "carbs": 0,
+        "fat": 13,
+        "fiber": 0,
+        "sugar": 0,
+        "sodium": 59,
+        "potassium": 366,
+        "vitamins": ["D", "B12"],
+        "tags": [],
+    },
+    "Sweet Potato": {
+        "calories": 180,
+        "protein": 2,
+        "carbs": 41.4,
+        "fat": 0.1,
+        "fiber": 6.6,
+        "sugar": 13,
+        "sodium": 36,
+        "potassium": 475,
+        "vitamins": ["A", "C"],
+        "tags": ["vegan", "vegetarian"],
+    },
+    "Greek Yogurt": {
+        "calories": 100,
+        "protein": 18,
+        "carbs": 6,
+        "fat": 0.7,
+        "fiber": 0,
+        "sugar": 6,
+        "sodium": 36,
+        "potassium": 141,
+        "vitamins": ["B12", "B2"],
+        "tags": ["vegetarian"],
+    },
+    "Spinach": {
+        "calories": 23,
+        "protein": 2.9,
+        "carbs": 3.6,
+        "fat": 0.4,
+        "fiber": 2.2,
+        "sugar": 0.4,
+        "sodium": 79,
+        "potassium": 558,
+        "vitamins": ["K", "A"],
+        "tags": ["vegan", "vegetarian"],
+    },
+}
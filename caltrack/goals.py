@@ -0,0 +1,45 @@
+import pandas as pd
+
+
+def weight_goal_progress(start_weight, current_weight, target_weight):
+    # Percent of the way from the start weight to the target, None if equal
+    if start_weight == target_weight:
+        return None
+    return (start_weight - current_weight) / (start_weight - target_weight) * 100
+
+
+def overall_changes(progress):
+    """Change of each measurement from its first to its last recorded value.
+
+    Entries may leave a measurement empty (NaN, or a weight of 0 in older
+    logs), so each column uses its own first and last values; columns with
+    fewer than two are left out.
+    """
+    changes = {}
+    for column in progress.columns[1:]:
+        values = progress[column]
+        if column == "Weight":
+            values = values.where(values > 0)
+        values = values.dropna()
+        if len(values) > 1:
+            changes[column] = values.iloc[-1] - values.iloc[0]
+    return changes
+
+
+def energy_inputs(first, last, burned, progress, intake_log):
+    """Daily intake, expenditure and weight between two days, for TdeeEstimator.
+
+    ``burned`` is a daily tracker frame (DAILY_COLUMNS), ``progress`` a
+    progress log frame and ``intake_log`` maps dates to logged kcal. Returns
+    a (days, 3) array of intake, burned and weight with NaN where missing.
+    """
+    burned = burned.set_index("Date")["Calories Burned"]
+    # Entries with only body measurements carry no weight (NaN, or 0 in
+    # older logs); a day's weight is its last real weigh-in
+    weight = progress["Weight"].where(progress["Weight"] > 0)
+    weight = weight.groupby(progress["Date"].dt.normalize()).last()
+    intake = pd.Series(intake_log, dtype=float)
+    intake.index = pd.to_datetime(intake.index)
+
+    days = pd.DataFrame({"intake": intake, "burned": burned, "weight": weight})
+    return days.reindex(pd.date_range(first, last)).to_numpy()
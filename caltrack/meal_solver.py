@@ -0,0 +1,214 @@
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+from .food_catalog import MACROS
+from .nutrition_engine import MEALS
+
+MEAL_RATIOS = dict(zip(MEALS, (0.25, 0.35, 0.30, 0.10)))  # Calorie distribution
+MACRO_SPLIT = {"protein": 0.30, "carbs": 0.40, "fat": 0.30}  # Share of calories
+KCAL_PER_GRAM = {"protein": 4, "carbs": 4, "fat": 9}
+
+# Relative weight of each target in the objective, in MACROS order
+TARGET_WEIGHTS = np.array([4.0, 1.0, 1.0, 1.0])
+
+MealSuggestion = namedtuple("MealSuggestion", ["foods", "totals", "target", "error"])
+
+
+def macro_targets(calories, split=MACRO_SPLIT):
+    # [calories, protein g, carbs g, fat g] for a calorie budget
+    return np.array(
+        [calories]
+        + [calories * split[m] / KCAL_PER_GRAM[m] for m in ("protein", "carbs", "fat")]
+    )
+
+
+def within_tolerance(totals, target, tol=0.10):
+    return bool(np.all(np.abs(totals - target) <= tol * np.maximum(target, 1)))
+
+
+def candidate_pool(catalog, target, candidates=None, pool_size=24):
+    """Pre-filter the catalog down to a small pool of rows worth combining.
+
+    Keeps the foods whose macro profile is closest to the target plus the
+    densest source of each macro, so a good combination is never pruned. The
+    scores are scale-invariant, so one pool serves every meal that shares the
+    same macro split.
+    """
+    macro_rows = catalog.nutrient_rows(MACROS)
+    if candidates is None:
+        profile = catalog.matrix[macro_rows]
+        candidates = np.arange(len(catalog))
+    else:
+        candidates = np.asarray(candidates, dtype=np.intp)
+        profile = catalog.matrix[np.ix_(macro_rows, candidates)]
+    if len(candidates) == 0:
+        return candidates
+
+    scaled = profile / np.asarray(target, dtype=np.float32)[:, None]
+    norms = np.sqrt(np.einsum("ij,ij->j", scaled, scaled))
+    norms[norms == 0] = np.inf
+    cosine = scaled.sum(axis=0) / norms
+
+    calories = np.where(profile[0] > 0, profile[0], np.inf)
+    rankings = [cosine] + [profile[i] / calories for i in range(1, len(macro_rows))]
+    per_ranking = max(pool_size // len(rankings), 1)
+
+    picked = []
+    for score in rankings:
+        k = min(per_ranking, len(score))
+        picked.append(np.argpartition(-score, k - 1)[:k])
+    pool = np.unique(np.concatenate(picked))
+    return candidates[pool[profile[0, pool] > 0]]
+
+
+PreparedPool = namedtuple(
+    "PreparedPool", ["rows", "profile", "combos", "mask", "systems", "unit_grams"]
+)
+
+
+@lru_cache(maxsize=None)
+def _combinations(n, size):
+    combos = np.array(list(combinations(range(n), size)), dtype=np.intp)
+    combos.flags.writeable = False
+    return combos
+
+
+def prepare_pool(catalog, pool, target, max_items=3):
+    """Solve every combination of ``pool`` rows for a 100 kcal version of ``target``.
+
+    With relative-error weights the least squares problem is linear in the
+    calorie budget: the unbounded solution for any budget with the same macro
+    profile is the 100 kcal solution scaled. Only rounding, bounds and
+    penalties are left for solve_prepared. Combinations of every size are
+    padded to ``max_items`` columns (with a zero column and ``mask`` False) so
+    they can be scored in one batch.
+    """
+    pool = np.asarray(pool, dtype=np.intp)
+    target = np.asarray(target, dtype=np.float64)
+    profile = target * (100 / target[0])
+    weights = np.sqrt(TARGET_WEIGHTS) / np.maximum(profile, 1e-6)
+    macro_rows = catalog.nutrient_rows(MACROS)
+    A = catalog.matrix[np.ix_(macro_rows, pool)] / 100 * weights[:, None]
+    b = np.sqrt(TARGET_WEIGHTS)
+
+    width = min(max_items, len(pool))
+    # Column len(pool) of the padded matrix is all zeros
+    A = np.hstack([A, np.zeros((len(b), 1))])
+    all_combos, all_grams = [], []
+    for size in range(1, width + 1):
+        combos = _combinations(len(pool), size)
+        Ac = A[:, combos].transpose(1, 0, 2)  # (n_combos, n_targets, size)
+        gram_matrix = Ac.transpose(0, 2, 1) @ Ac + 1e-9 * np.eye(size)
+        rhs = Ac.transpose(0, 2, 1) @ b
+        unit_grams = np.linalg.solve(gram_matrix, rhs[..., None])[..., 0]
+        padding = ((0, 0), (0, width - size))
+        all_combos.append(np.pad(combos, padding, constant_values=len(pool)))
+        all_grams.append(np.pad(unit_grams, padding))
+
+    if not all_combos:
+        combos = np.empty((0, 0), dtype=np.intp)
+        return PreparedPool(
+            pool, profile, combos, combos > 0, np.empty((0, len(MACROS), 0)), []
+        )
+    combos = np.concatenate(all_combos)
+    systems = A[:, combos].transpose(1, 0, 2)  # (n_combos, n_targets, width)
+    return PreparedPool(
+        pool, profile, combos, combos < len(pool), systems, np.concatenate(all_grams)
+    )
+
+
+def solve_prepared(
+    catalog,
+    prepared,
+    calories,
+    penalty=None,
+    min_grams=25,
+    max_grams=300,
+    step=5,
+    top_k=1,
+    pool_penalty=None,
+):
+    # Scale the prepared solutions to the calorie budget, round and bound them,
+    # then rank every combination by weighted relative error plus penalty.
+    # ``penalty`` is indexed by catalog row, ``pool_penalty`` by pool position.
+    if len(prepared.combos) == 0:
+        return []
+    scale = calories / 100
+    extra = np.zeros(len(prepared.rows) + 1)
+    if penalty is not None:
+        extra[:-1] += np.asarray(penalty)[prepared.rows]
+    if pool_penalty is not None:
+        extra[:-1] += pool_penalty
+
+    grams = np.round(prepared.unit_grams * (scale / step)) * step
+    grams = np.clip(grams, min_grams, max_grams) * prepared.mask
+    residual = np.einsum("nij,nj->ni", prepared.systems, grams) / scale
+    residual -= np.sqrt(TARGET_WEIGHTS)
+    errors = (residual**2).sum(axis=1) + extra[prepared.combos].sum(axis=1)
+
+    macro_rows = catalog.nutrient_rows(MACROS)
+    target = prepared.profile * scale
+    suggestions = []
+    # Stable sort, so ties go to fewer items, then to the earlier combination
+    for i in np.argsort(errors, kind="stable")[:top_k]:
+        used = prepared.mask[i]
+        rows, amounts = prepared.rows[prepared.combos[i][used]], grams[i][used]
+        totals = catalog.totals(rows, amounts)[macro_rows]
+        foods = [(catalog.names[r], int(g)) for r, g in zip(rows, amounts)]
+        suggestions.append(MealSuggestion(foods, totals, target, float(errors[i])))
+    return suggestions
+
+
+def solve_meal(
+    catalog,
+    target,
+    candidates=None,
+    pool=None,
+    penalty=None,
+    max_items=3,
+    pool_size=24,
+    **options,
+):
+    """Pick up to ``max_items`` foods and gram amounts that best hit ``target``.
+
+    ``target`` is [calories, protein, carbs, fat]. Every combination from the
+    pre-filtered candidate ``pool`` (see candidate_pool) is solved at once as
+    a bounded weighted least squares problem. ``penalty`` optionally adds a
+    cost per catalog row, e.g. to discourage repeating foods across meals.
+    Returns up to ``top_k`` suggestions ordered from best to worst.
+    """
+    if pool is None:
+        pool = candidate_pool(catalog, target, candidates, pool_size)
+    prepared = prepare_pool(catalog, pool, target, max_items)
+    return solve_prepared(catalog, prepared, target[0], penalty, **options)
+
+
+def suggest_day_plan(
+    catalog,
+    calorie_goal,
+    ratios=MEAL_RATIOS,
+    split=MACRO_SPLIT,
+    repeat_penalty=0.05,
+    candidates=None,
+    pool_size=24,
+    max_items=3,
+    **options,
+):
+    # Every meal shares the macro split, so the catalog is filtered only once.
+    # Meals are solved in turn, discouraging foods already used that day.
+    target = macro_targets(calorie_goal, split)
+    pool = candidate_pool(catalog, target, candidates, pool_size)
+    prepared = prepare_pool(catalog, pool, target, max_items)
+    penalty = np.zeros(len(catalog))
+    plan = {}
+    for meal, ratio in ratios.items():
+        best = solve_prepared(
+            catalog, prepared, calorie_goal * ratio, penalty, **options
+        )
+        plan[meal] = best[0] if best else None
+        if best:
+            penalty[catalog.rows(food for food, _ in best[0].foods)] += repeat_penalty
+    return plan
@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe memo with LRU eviction and an optional time-to-live.
+
+    Holds at most ``maxsize`` results, and at most ``max_cost`` in total if
+    set, where each entry is charged the cost given when it is stored; the
+    least recently used one is evicted first. With a ``ttl``, a result
+    older than ``ttl`` seconds is recomputed on its next lookup. Counters of
+    hits, misses, evictions and expirations are kept for monitoring. Values
+    are shared between callers, so they must not be mutated.
+    """
+
+    def __init__(self, maxsize=4096, ttl=None, max_cost=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_cost = max_cost
+        self.clock = clock
+        self.cost = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()  # key -> (value, stored at, cost)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute, cost=0):
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl is None or now - entry[1] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+                self.cost -= entry[2]
+                self.expirations += 1
+            self.misses += 1
+
+        # Computed outside the lock; concurrent misses on one key may both
+        # compute, and the first result stored wins
+        value = compute()
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0]
+            self._entries[key] = (value, now, cost)
+            self.cost += cost
+            while self._entries and (
+                len(self._entries) > self.maxsize
+                or (self.max_cost is not None and self.cost > self.max_cost)
+            ):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.cost -= evicted
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "cost": self.cost,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.cost = 0
@@ -0,0 +1,112 @@
+import numpy as np
+
+from .food_catalog import NUTRIENTS
+
+MEALS = ("Breakfast", "Lunch", "Dinner", "Snacks")
+
+
+def plan_arrays(catalog, meal_plan, meals=MEALS):
+    # Flatten a {meal: [(food, grams), ...]} plan into (meal_id, food_row, grams)
+    items = [
+        (meal_id, catalog.row(food), amount)
+        for meal_id, meal in enumerate(meals)
+        for food, amount in meal_plan.get(meal, [])
+    ]
+    if not items:
+        return (
+            np.empty(0, dtype=np.intp),
+            np.empty(0, dtype=np.intp),
+            np.empty(0, dtype=np.float64),
+        )
+    meal_ids, rows, grams = zip(*items)
+    return (
+        np.asarray(meal_ids, dtype=np.intp),
+        np.asarray(rows, dtype=np.intp),
+        np.asarray(grams, dtype=np.float64),
+    )
+
+
+def batch_arrays(catalog, meal_plans, meals=MEALS):
+    # Concatenate many plans into (plan_id, meal_id, food_row, grams) arrays
+    parts = [plan_arrays(catalog, plan, meals) for plan in meal_plans]
+    plan_ids = np.repeat(
+        np.arange(len(parts), dtype=np.intp), [len(p[0]) for p in parts]
+    )
+    if not parts:
+        return plan_ids, *plan_arrays(catalog, {}, meals)
+    meal_ids, rows, grams = (np.concatenate(cols) for cols in zip(*parts))
+    return plan_ids, meal_ids, rows, grams
+
+
+def batch_nutrition(
+    catalog, plan_ids, meal_ids, rows, grams, n_plans, n_meals=len(MEALS)
+):
+    # Per-meal totals for many plans, shape (n_plans, n_meals, len(NUTRIENTS)).
+    # Items are scaled once and aggregated with one bincount per nutrient.
+    plan_ids = np.asarray(plan_ids, dtype=np.intp)
+    meal_ids = np.asarray(meal_ids, dtype=np.intp)
+    rows = np.asarray(rows, dtype=np.intp)
+    factors = np.asarray(grams, dtype=np.float64) / 100
+
+    slots = plan_ids * n_meals + meal_ids
+    size = n_plans * n_meals
+    out = np.empty((len(NUTRIENTS), size))
+    for i in range(len(NUTRIENTS)):
+        out[i] = np.bincount(
+            slots, weights=catalog.column_at(i, rows) * factors, minlength=size
+        )
+    return out.T.reshape(n_plans, n_meals, len(NUTRIENTS))
+
+
+def plan_nutrition(catalog, meal_plan, meals=MEALS):
+    # Per-meal and per-day totals for a single plan in one pass
+    meal_ids, rows, grams = plan_arrays(catalog, meal_plan, meals)
+    per_meal = batch_nutrition(
+        catalog, np.zeros_like(meal_ids), meal_ids, rows, grams, 1, len(meals)
+    )[0]
+    return per_meal, per_meal.sum(axis=0)
+
+
+def as_dict(totals, nutrients=NUTRIENTS):
+    return {n: float(totals[NUTRIENTS.index(n)]) for n in nutrients}
+
+
+class RunningTotals:
+    """Per-meal and per-day nutrient accumulators for an editable plan.
+
+    Adding or removing an item updates the totals with a single column of the
+    catalog instead of recomputing the whole plan.
+    """
+
+    def __init__(self, catalog, meals=MEALS):
+        self.catalog = catalog
+        self.meals = tuple(meals)
+        self.per_meal = np.zeros((len(self.meals), len(NUTRIENTS)))
+        self.day = np.zeros(len(NUTRIENTS))
+
+    @classmethod
+    def from_plan(cls, catalog, meal_plan, meals=MEALS):
+        totals = cls(catalog, meals)
+        totals.per_meal, totals.day = plan_nutrition(catalog, meal_plan, meals)
+        return totals
+
+    def _item(self, food, grams):
+        column = self.catalog.columns([self.catalog.row(food)])[:, 0]
+        return column.astype(np.float64) * (grams / 100)
+
+    def add(self, meal, food, grams):
+        item = self._item(food, grams)
+        self.per_meal[self.meals.index(meal)] += item
+        self.day += item
+
+    def remove(self, meal, food, grams):
+        item = self._item(food, grams)
+        self.per_meal[self.meals.index(meal)] -= item
+        self.day -= item
+
+    def check(self, meal_plan, rtol=1e-6, atol=1e-6):
+        # Full recomputation, used to validate the accumulators in debug mode
+        per_meal, day = plan_nutrition(self.catalog, meal_plan, self.meals)
+        return np.allclose(self.per_meal, per_meal, rtol, atol) and np.allclose(
+            self.day, day, rtol, atol
+        )
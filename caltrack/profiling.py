@@ -0,0 +1,211 @@
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger("caltrack.profile")
+
+# Names of the sections being timed, outermost first, and the timings of
+# the current run; both are per thread, so concurrent sessions don't mix
+_path = contextvars.ContextVar("caltrack_profile_path", default=())
+_run = contextvars.ContextVar("caltrack_profile_run", default=None)
+
+
+class Profiler:
+    """Process-wide timings of named sections, reruns and session memory.
+
+    ``section(name)`` times a block; nested sections are named by their
+    path, e.g. ``Meal Planner / suggest plan``. ``run(page)`` wraps one
+    script run of a page: it counts the rerun and collects the run's
+    section timings, so a debug panel can show where that run spent its
+    time. Totals are kept as count, sum and max per section and exported as
+    JSON or in the Prometheus text format. A disabled profiler times
+    nothing.
+    """
+
+    def __init__(self, enabled=True, clock=time.perf_counter, max_sessions=1024):
+        self.enabled = enabled
+        self.clock = clock
+        self.max_sessions = max_sessions
+        self._sections = {}  # name -> [count, total seconds, max seconds]
+        self._reruns = {}  # page -> count
+        self._memory = OrderedDict()  # session -> bytes, latest sample
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        path = _path.get() + (name,)
+        token = _path.set(path)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            _path.reset(token)
+            self.observe(" / ".join(path), self.clock() - start)
+
+    @contextmanager
+    def run(self, page):
+        # Yields the list of (section, seconds) timed during this run
+        timings = []
+        if self.enabled:
+            with self._lock:
+                self._reruns[page] = self._reruns.get(page, 0) + 1
+        token = _run.set(timings)
+        try:
+            with self.section(page):
+                yield timings
+        finally:
+            _run.reset(token)
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._sections.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+        timings = _run.get()
+        if timings is not None:
+            timings.append((name, seconds))
+
+    def record_memory(self, session, nbytes):
+        with self._lock:
+            self._memory[session] = nbytes
+            self._memory.move_to_end(session)
+            while len(self._memory) > self.max_sessions:
+                self._memory.popitem(last=False)
+
+    def snapshot(self):
+        with self._lock:
+            memory = list(self._memory.values())
+            return {
+                "sections": {
+                    name: {
+                        "count": count,
+                        "total_seconds": total,
+                        "mean_seconds": total / count,
+                        "max_seconds": worst,
+                    }
+                    for name, (count, total, worst) in sorted(self._sections.items())
+                },
+                "reruns": dict(sorted(self._reruns.items())),
+                "session_state_bytes": {
+                    "sessions": len(memory),
+                    "total": sum(memory),
+                    "max": max(memory, default=0),
+                },
+            }
+
+    def prometheus(self):
+        # Snapshot in the Prometheus text exposition format
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP caltrack_section_seconds Time spent in app sections.",
+            "# TYPE caltrack_section_seconds summary",
+        ]
+        for name, stats in snapshot["sections"].items():
+            label = f'{{section="{_escape(name)}"}}'
+            lines.append(f"caltrack_section_seconds_count{label} {stats['count']}")
+            lines.append(
+                f"caltrack_section_seconds_sum{label} {stats['total_seconds']:.6f}"
+            )
+        lines += [
+            "# HELP caltrack_section_seconds_max Slowest run of each section.",
+            "# TYPE caltrack_section_seconds_max gauge",
+        ]
+        for name, stats in snapshot["sections"].items():
+            lines.append(
+                f'caltrack_section_seconds_max{{section="{_escape(name)}"}} '
+                f"{stats['max_seconds']:.6f}"
+            )
+        lines += [
+            "# HELP caltrack_reruns_total Script runs per page.",
+            "# TYPE caltrack_reruns_total counter",
+        ]
+        for page, count in snapshot["reruns"].items():
+            lines.append(f'caltrack_reruns_total{{page="{_escape(page)}"}} {count}')
+        memory = snapshot["session_state_bytes"]
+        lines += [
+            "# HELP caltrack_session_state_bytes Estimated session state size, "
+            "latest sample per session.",
+            "# TYPE caltrack_session_state_bytes gauge",
+            f'caltrack_session_state_bytes{{stat="total"}} {memory["total"]}',
+            f'caltrack_session_state_bytes{{stat="max"}} {memory["max"]}',
+            "# HELP caltrack_sessions_sampled Sessions with a memory sample.",
+            "# TYPE caltrack_sessions_sampled gauge",
+            f"caltrack_sessions_sampled {memory['sessions']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        # For the node exporter textfile collector; replaced atomically
+        with open(path + ".tmp", "w") as f:
+            f.write(self.prometheus())
+        os.replace(path + ".tmp", path)
+
+    def log_run(self, page, timings, **fields):
+        # One structured log record per run, as JSON
+        record = {
+            "event": "run",
+            "page": page,
+            **fields,
+            "sections": {name: round(seconds, 6) for name, seconds in timings},
+        }
+        logger.info(json.dumps(record))
+
+    def reset(self):
+        with self._lock:
+            self._sections.clear()
+            self._reruns.clear()
+            self._memory.clear()
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def deep_size(obj, seen=None, shared=()):
+    """Rough number of bytes held by an object and everything it references.
+
+    Arrays count the data they own, so views and memory-mapped arrays count
+    only their header; DataFrames report their columns. Containers and plain
+    objects are walked, counting each object once. Objects already in
+    ``seen`` (ids) and instances of the ``shared`` types count nothing, so
+    resources shared between sessions aren't charged to one of them.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, shared):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj, 0)
+    module = type(obj).__module__
+    if module.startswith("numpy"):
+        return size
+    if module.startswith("pandas") and hasattr(obj, "memory_usage"):
+        usage = obj.memory_usage(deep=True)
+        if hasattr(usage, "sum"):  # per column for DataFrames
+            usage = usage.sum()
+        return size + int(usage)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(
+            deep_size(k, seen, shared) + deep_size(v, seen, shared)
+            for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_size(item, seen, shared) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen, shared)
+    return size
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+from .progress_store import PROGRESS_COLUMNS
+
+MEASUREMENTS = PROGRESS_COLUMNS[1:]
+
+
+class ProgressLog:
+    """Growable columnar buffer of progress entries, kept sorted by date.
+
+    Each column is a preallocated NumPy array whose capacity doubles when
+    full, so in-order appends are amortized O(1). An entry dated before the
+    latest one is placed by binary search. ``frame`` and ``window`` wrap the
+    filled part of the arrays in a DataFrame without copying them and are
+    cached until the next change, tracked by ``version``.
+
+    Frames handed out never change afterwards: appends write past their end,
+    and out-of-order inserts build new arrays instead of shifting in place.
+    """
+
+    def __init__(self, capacity=64):
+        self._size = 0
+        self._dates = np.empty(capacity, dtype="datetime64[ns]")
+        self._values = {c: np.empty(capacity) for c in MEASUREMENTS}
+        self.version = 0
+        self._cache_key = None
+        self._cache = None
+
+    @classmethod
+    def from_frame(cls, frame):
+        log = cls(capacity=max(64, len(frame)))
+        log.extend(frame)
+        return log
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, size):
+        capacity = len(self._dates)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        self._dates = np.resize(self._dates, capacity)
+        self._values = {c: np.resize(v, capacity) for c, v in self._values.items()}
+
+    @staticmethod
+    def _inserted(values, size, position, value):
+        out = np.empty(max(len(values), size + 1), dtype=values.dtype)
+        out[:position] = values[:position]
+        out[position] = value
+        out[position + 1 : size + 1] = values[position:size]
+        return out
+
+    def append(self, entry):
+        # Add one entry, a mapping with the PROGRESS_COLUMNS keys
+        date = np.datetime64(pd.Timestamp(entry["Date"]), "ns")
+        position = self._size
+        if self._size and date < self._dates[self._size - 1]:
+            position = np.searchsorted(self._dates[: self._size], date, side="right")
+
+        if position == self._size:
+            self._reserve(self._size + 1)
+            self._dates[position] = date
+            for column, values in self._values.items():
+                values[position] = entry[column]
+        else:
+            size = self._size
+            self._dates = self._inserted(self._dates, size, position, date)
+            self._values = {
+                c: self._inserted(v, size, position, entry[c])
+                for c, v in self._values.items()
+            }
+        self._size += 1
+        self.version += 1
+
+    def extend(self, frame):
+        start, end = self._size, self._size + len(frame)
+        self._reserve(end)
+        self._dates[start:end] = pd.to_datetime(frame["Date"]).to_numpy(
+            "datetime64[ns]"
+        )
+        for column, values in self._values.items():
+            values[start:end] = frame[column].to_numpy(dtype=np.float64)
+        self._size = end
+
+        dates = self._dates[:end]
+        if np.any(dates[1:] < dates[:-1]):
+            order = np.argsort(dates, kind="stable")
+            self._dates = np.resize(dates[order], len(self._dates))
+            self._values = {
+                c: np.resize(v[:end][order], len(v)) for c, v in self._values.items()
+            }
+        self.version += 1
+
+    def column(self, name):
+        if name == "Date":
+            return self._dates[: self._size]
+        return self._values[name][: self._size]
+
+    def window(self, start=None):
+        # Entries dated on or after start, found by binary search
+        key = (self.version, start)
+        if key != self._cache_key:
+            first = 0
+            if start is not None:
+                first = np.searchsorted(
+                    self.column("Date"), np.datetime64(pd.Timestamp(start), "ns")
+                )
+            columns = {c: self.column(c)[first:] for c in PROGRESS_COLUMNS}
+            self._cache = pd.DataFrame(columns, copy=False)
+            self._cache_key = key
+        return self._cache
+
+    def frame(self):
+        return self.window(None)
@@ -0,0 +1,150 @@
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+PROGRESS_COLUMNS = ["Date", "Weight", "Body Fat %", "Waist", "Chest", "Arms", "Thighs"]
+
+# DataFrame column -> SQL column
+_SQL_COLUMNS = {
+    "Date": "date",
+    "Weight": "weight",
+    "Body Fat %": "body_fat",
+    "Waist": "waist",
+    "Chest": "chest",
+    "Arms": "arms",
+    "Thighs": "thighs",
+}
+
+_SELECT_COLUMNS = ", ".join(_SQL_COLUMNS.values())
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    user_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    weight REAL,
+    body_fat REAL,
+    waist REAL,
+    chest REAL,
+    arms REAL,
+    thighs REAL
+);
+CREATE INDEX IF NOT EXISTS idx_progress_user_date ON progress (user_id, date);
+"""
+
+
+def _date_key(value):
+    # Dates are stored as ISO "YYYY-MM-DD" text so they sort and compare
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+class ProgressRepository:
+    """SQLite-backed store for logged body measurements.
+
+    Writes are queued and flushed in one transaction once ``batch_size``
+    rows are pending or ``flush_interval`` seconds have passed, by a
+    background timer if no other write comes; reads flush first so they
+    always see earlier writes. The database runs in WAL mode
+    so concurrent sessions can read while another one writes.
+    """
+
+    def __init__(self, path, batch_size=50, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._timer = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, user_id, entry):
+        # Queue one entry, a mapping with the PROGRESS_COLUMNS keys
+        with self._lock:
+            self._pending.append(self._to_row(user_id, entry))
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if len(self._pending) >= self.batch_size or due:
+                self._flush_locked()
+            elif self._timer is None:
+                # Written within the interval even if nothing else happens
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def add_many(self, user_id, entries):
+        with self._lock:
+            self._pending.extend(self._to_row(user_id, e) for e in entries)
+            self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            marks = ", ".join("?" * (len(_SQL_COLUMNS) + 1))
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT INTO progress (user_id, {_SELECT_COLUMNS}) "
+                    f"VALUES ({marks})",
+                    self._pending,
+                )
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def _to_row(user_id, entry):
+        values = [float(entry[c]) for c in PROGRESS_COLUMNS[1:]]
+        return (user_id, _date_key(entry["Date"]), *values)
+
+    def _query(self, sql, params):
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute(sql, params).fetchall()
+
+    def window(self, user_id, start=None, end=None):
+        # Entries for one user between start and end (inclusive), sorted by date
+        sql = f"SELECT {_SELECT_COLUMNS} FROM progress WHERE user_id = ?"
+        params = [user_id]
+        if start is not None:
+            sql += " AND date >= ?"
+            params.append(_date_key(start))
+        if end is not None:
+            sql += " AND date <= ?"
+            params.append(_date_key(end))
+        rows = self._query(sql + " ORDER BY date, rowid", params)
+
+        frame = pd.DataFrame(rows, columns=PROGRESS_COLUMNS)
+        frame["Date"] = pd.to_datetime(frame["Date"])
+        return frame
+
+    def first_last(self, user_id, column):
+        # Earliest and latest recorded value of one column, or None without
+        # any; missing measurements are NULL (0 in older logs)
+        sql_column = _SQL_COLUMNS[column]
+        rows = self._query(
+            f"""
+            SELECT {sql_column} FROM (
+                SELECT * FROM (SELECT {sql_column} FROM progress WHERE user_id = ?
+                               AND {sql_column} > 0 ORDER BY date, rowid LIMIT 1)
+                UNION ALL
+                SELECT * FROM (SELECT {sql_column} FROM progress WHERE user_id = ?
+                               AND {sql_column} > 0
+                               ORDER BY date DESC, rowid DESC LIMIT 1)
+            )
+            """,
+            (user_id, user_id),
+        )
+        return (rows[0][0], rows[1][0]) if rows else None
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
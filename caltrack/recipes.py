@@ -0,0 +1,176 @@
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from .food_catalog import NUTRIENTS, CatalogOverlay
+
+# A recipe made of (food or recipe name, grams) ingredients. The cooked dish
+# weighs cooked_grams when given, otherwise the raw weight less the
+# cooking_loss fraction (water lost; nutrients stay in the dish).
+Recipe = namedtuple(
+    "Recipe",
+    ["name", "ingredients", "cooked_grams", "cooking_loss"],
+    defaults=(None, 0.0),
+)
+
+
+def cooked_weight(recipe):
+    if recipe.cooked_grams:
+        return float(recipe.cooked_grams)
+    return sum(grams for _, grams in recipe.ingredients) * (1 - recipe.cooking_loss)
+
+
+class RecipeBook:
+    """Recipes over a FoodCatalog, kept as a DAG of foods and sub-recipes.
+
+    ``catalog`` overlays one row per recipe on the shared food catalog, so
+    the nutrition engine and meal plans look a recipe up like any food
+    while the food arrays stay shared.
+    Nutrients per 100 g are memoized per recipe; changing a recipe or a
+    food only recomputes the recipes that use it, directly or through
+    sub-recipes. Recipes must be added after their ingredients, which
+    rules out cycles except when a recipe is replaced, where they are
+    rejected.
+    """
+
+    def __init__(self, foods):
+        self.foods = foods
+        self.catalog = foods
+        self.recipes = {}
+        self._used_by = defaultdict(set)  # ingredient -> recipes using it
+        self._per_100g = {}
+
+    @classmethod
+    def from_dict(cls, foods, definitions):
+        # Definitions as stored by to_dict, added ingredients first
+        book = cls(foods)
+        pending = {name: Recipe(name, *fields) for name, fields in definitions.items()}
+
+        def add(name):
+            recipe = pending.pop(name)
+            for ingredient, _ in recipe.ingredients:
+                if ingredient in pending:
+                    add(ingredient)
+            book.add(recipe)
+
+        while pending:
+            add(next(iter(pending)))
+        return book
+
+    def to_dict(self):
+        return {
+            name: [
+                [list(item) for item in r.ingredients],
+                r.cooked_grams,
+                r.cooking_loss,
+            ]
+            for name, r in self.recipes.items()
+        }
+
+    def __contains__(self, name):
+        return name in self.recipes
+
+    @property
+    def names(self):
+        return list(self.recipes)
+
+    def add(self, recipe):
+        """Add a recipe, or replace the one with the same name."""
+        recipe = recipe._replace(
+            ingredients=tuple(
+                (food, float(grams)) for food, grams in recipe.ingredients
+            )
+        )
+        if recipe.name in self.foods:
+            raise ValueError(f"{recipe.name!r} is already a food")
+        if not recipe.ingredients or cooked_weight(recipe) <= 0:
+            raise ValueError(f"Recipe {recipe.name!r} has no weight")
+        for ingredient, _ in recipe.ingredients:
+            if ingredient not in self.foods and ingredient not in self.recipes:
+                raise ValueError(f"Unknown ingredient {ingredient!r}")
+        if recipe.name in self.recipes:
+            users = self._affected(recipe.name)
+            if any(ingredient in users for ingredient, _ in recipe.ingredients):
+                raise ValueError(f"Recipe {recipe.name!r} would contain itself")
+
+        previous = self.recipes.get(recipe.name)
+        if previous is not None:
+            for ingredient, _ in previous.ingredients:
+                self._used_by[ingredient].discard(recipe.name)
+        for ingredient, _ in recipe.ingredients:
+            self._used_by[ingredient].add(recipe.name)
+        self.recipes[recipe.name] = recipe
+
+        if previous is None:
+            self._rebuild_catalog()
+        else:
+            self.invalidate(recipe.name)
+
+    def remove(self, name):
+        users = self._used_by.get(name)
+        if users:
+            raise ValueError(f"{name!r} is used by {', '.join(sorted(users))}")
+        recipe = self.recipes.pop(name)
+        for ingredient, _ in recipe.ingredients:
+            self._used_by[ingredient].discard(name)
+        self._used_by.pop(name, None)
+        self._per_100g.pop(name, None)
+        self._rebuild_catalog()
+
+    def _affected(self, name):
+        # name and every recipe using it, directly or through sub-recipes
+        affected, stack = {name}, [name]
+        while stack:
+            for user in self._used_by.get(stack.pop(), ()):
+                if user not in affected:
+                    affected.add(user)
+                    stack.append(user)
+        return affected
+
+    def invalidate(self, name):
+        """Recompute the recipes affected by a change to a food or recipe.
+
+        Returns the names of the recipes whose nutrients were recomputed.
+        """
+        affected = self._affected(name) & self.recipes.keys()
+        for recipe in affected:
+            self._per_100g.pop(recipe, None)
+        for recipe in affected:
+            self.catalog.update(recipe, self.per_100g(recipe), *self._masks(recipe))
+        return affected
+
+    def per_100g(self, name):
+        # Nutrients per 100 g of a food or recipe, in NUTRIENTS order
+        if name not in self.recipes:
+            return self.foods.matrix[:, self.foods.row(name)].astype(np.float64)
+        if name not in self._per_100g:
+            recipe = self.recipes[name]
+            total = np.zeros(len(NUTRIENTS))
+            for ingredient, grams in recipe.ingredients:
+                total += self.per_100g(ingredient) * (grams / 100)
+            self._per_100g[name] = total * (100 / cooked_weight(recipe))
+        return self._per_100g[name]
+
+    def _masks(self, name):
+        # Vitamins of any ingredient; diet tags shared by all of them
+        if name not in self.recipes:
+            row = self.foods.row(name)
+            return int(self.foods.vitamin_masks[row]), int(self.foods.tag_masks[row])
+        vitamins, tags = 0, ~0
+        for ingredient, _ in self.recipes[name].ingredients:
+            v, t = self._masks(ingredient)
+            vitamins, tags = vitamins | v, tags & t
+        return vitamins, tags & 0xFFFFFFFF
+
+    def _rebuild_catalog(self):
+        # Only the recipe rows are built; the foods stay in the shared catalog
+        names = self.names
+        if not names:
+            self.catalog = self.foods
+            return
+        matrix = np.zeros((len(NUTRIENTS), len(names)))
+        masks = np.zeros((2, len(names)), dtype=np.uint32)
+        for i, name in enumerate(names):
+            matrix[:, i] = self.per_100g(name)
+            masks[:, i] = self._masks(name)
+        self.catalog = CatalogOverlay(self.foods, names, matrix, masks[0], masks[1])
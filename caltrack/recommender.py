@@ -0,0 +1,139 @@
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from .food_catalog import MACROS
+from .meal_solver import (
+    KCAL_PER_GRAM,
+    candidate_pool,
+    macro_targets,
+    prepare_pool,
+    solve_prepared,
+)
+
+SLOT_RATIOS = {"Breakfast": 0.3, "Lunch": 0.3, "Dinner": 0.3, "Snack": 0.1}
+
+# Share of calories from protein/carbs/fat for each diet
+DIET_SPLITS = {
+    "Balanced": {"protein": 0.30, "carbs": 0.40, "fat": 0.30},
+    "High-protein": {"protein": 0.40, "carbs": 0.30, "fat": 0.30},
+    "Low-carb": {"protein": 0.35, "carbs": 0.15, "fat": 0.50},
+    "Vegetarian": {"protein": 0.25, "carbs": 0.45, "fat": 0.30},
+    "Vegan": {"protein": 0.20, "carbs": 0.50, "fat": 0.30},
+}
+
+# Weight of each nutrient density (per 100 kcal) in the food quality score
+QUALITY_WEIGHTS = {
+    "protein": 1.0,
+    "fiber": 2.0,
+    "potassium": 0.01,
+    "sugar": -1.0,
+    "sodium": -0.005,
+}
+
+
+class MealRecommender:
+    """Diet-aware meal recommendations over a FoodCatalog.
+
+    Candidate rows, quality penalties and prepared solver pools are computed
+    once per diet when the recommender is built, so a request only scales,
+    rounds and ranks the prepared combinations. Slots are filled in order and
+    foods already chosen for an earlier slot are penalised. Results are
+    memoized per (diet, calorie target, top_k) and shared by every caller,
+    so they are handed out read-only: a mapping of slot to a tuple of
+    suggestions, with tuples of foods and read-only arrays.
+    """
+
+    def __init__(
+        self,
+        catalog,
+        pool_size=12,
+        quality_weight=0.05,
+        repeat_penalty=0.05,
+        cache_size=4096,
+    ):
+        self.catalog = catalog
+        self.pool_size = pool_size
+        self.repeat_penalty = repeat_penalty
+        self.penalty = quality_weight * (1 - self._quality(catalog))
+        self.candidates = {diet: self._diet_rows(diet) for diet in DIET_SPLITS}
+        self.prepared = {
+            diet: prepare_pool(
+                catalog, self._pool(diet, rows), macro_targets(100, DIET_SPLITS[diet])
+            )
+            for diet, rows in self.candidates.items()
+        }
+        self.recommend = lru_cache(maxsize=cache_size)(self._recommend)
+
+    @staticmethod
+    def _quality(catalog):
+        # Nutrient density score in [0, 1], vectorized over the whole catalog
+        calories = catalog.column("calories").astype(np.float64)
+        per_100_kcal = 100 / np.where(calories > 0, calories, np.inf)
+        score = sum(
+            weight * catalog.column(n) * per_100_kcal
+            for n, weight in QUALITY_WEIGHTS.items()
+        )
+        low, high = score.min(initial=0), score.max(initial=0)
+        return (score - low) / (high - low) if high > low else np.ones_like(score)
+
+    def _macro_share(self, nutrient):
+        calories = self.catalog.column("calories").astype(np.float64)
+        energy = self.catalog.column(nutrient) * KCAL_PER_GRAM[nutrient]
+        return energy / np.where(calories > 0, calories, np.inf)
+
+    def _diet_rows(self, diet):
+        if diet == "Vegetarian":
+            return self.catalog.with_tag("vegetarian")
+        if diet == "Vegan":
+            return self.catalog.with_tag("vegan")
+        if diet == "High-protein":
+            return np.flatnonzero(self._macro_share("protein") >= 0.25)
+        if diet == "Low-carb":
+            return np.flatnonzero(self._macro_share("carbs") <= 0.25)
+        return np.arange(len(self.catalog))
+
+    def _pool(self, diet, rows):
+        # Best-matching foods for the diet's macro split, then the highest
+        # quality foods among the remaining candidates
+        target = macro_targets(100, DIET_SPLITS[diet])
+        pool = candidate_pool(self.catalog, target, rows, self.pool_size)
+        rest = np.setdiff1d(rows, pool)
+        k = min(max(self.pool_size - len(pool), 0), len(rest))
+        if k:
+            best = rest[np.argpartition(self.penalty[rest], k - 1)[:k]]
+            pool = np.union1d(pool, best)
+        return pool
+
+    def _recommend(self, diet, calorie_target, top_k=3):
+        prepared = self.prepared[diet]
+        penalty = self.penalty[prepared.rows]
+        meals = {}
+        for slot, ratio in SLOT_RATIOS.items():
+            meals[slot] = solve_prepared(
+                self.catalog,
+                prepared,
+                calorie_target * ratio,
+                top_k=top_k,
+                pool_penalty=penalty,
+            )
+            if meals[slot]:
+                chosen = self.catalog.rows(food for food, _ in meals[slot][0].foods)
+                penalty = penalty + self.repeat_penalty * np.isin(prepared.rows, chosen)
+            meals[slot] = tuple(_frozen(s) for s in meals[slot])
+        return MappingProxyType(meals)
+
+
+def _frozen(suggestion):
+    for array in (suggestion.totals, suggestion.target):
+        array.flags.writeable = False
+    return suggestion._replace(foods=tuple(suggestion.foods))
+
+
+def describe(suggestion):
+    totals = dict(zip(MACROS, suggestion.totals))
+    return (
+        f"{totals['calories']:.0f} kcal (Protein: {totals['protein']:.0f}g, "
+        f"Carbs: {totals['carbs']:.0f}g, Fat: {totals['fat']:.0f}g)"
+    )
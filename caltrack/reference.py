@@ -0,0 +1,67 @@
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .coverage import NutrientDensityIndex
+from .food_catalog import NUTRIENTS
+from .food_search import FoodSearchIndex
+from .memo import LRUCache
+from .recommender import MealRecommender
+
+# Nutrients of an amount of one food, with the table shown for it
+FoodAnalysis = namedtuple(
+    "FoodAnalysis", ["food", "grams", "nutrients", "table", "vitamins"]
+)
+
+
+class FoodReference:
+    """The food catalog with everything derived from it, shared process-wide.
+
+    The search index, the recommender and the nutrient density index are
+    built on first use, once, even with concurrent callers. ``analyze``
+    memoizes per-(food, grams) results in a bounded TTL cache, so sessions
+    looking at the same food share one result.
+    """
+
+    def __init__(self, catalog, analysis_size=4096, analysis_ttl=600.0):
+        self.catalog = catalog
+        self.analyses = LRUCache(analysis_size, ttl=analysis_ttl)
+        self._built = {}
+        self._lock = threading.Lock()
+
+    def _once(self, name, build):
+        if name not in self._built:
+            with self._lock:
+                if name not in self._built:
+                    self._built[name] = build()
+        return self._built[name]
+
+    @property
+    def search_index(self):
+        return self._once("search_index", lambda: FoodSearchIndex(self.catalog.names))
+
+    @property
+    def recommender(self):
+        return self._once("recommender", lambda: MealRecommender(self.catalog))
+
+    @property
+    def density_index(self):
+        return self._once("density_index", lambda: NutrientDensityIndex(self.catalog))
+
+    def analyze(self, food, grams):
+        return self.analyses.get_or_compute(
+            (food, grams), lambda: self._analyze(food, grams)
+        )
+
+    def _analyze(self, food, grams):
+        row = self.catalog.row(food)
+        values = self.catalog.scale([row], [grams])[0].astype(np.float64)
+        table = pd.DataFrame(
+            {"Value": values.round(2)}, index=pd.Index(NUTRIENTS, name="Nutrient")
+        )
+        vitamins = tuple(self.catalog.vitamin_names(row))
+        return FoodAnalysis(
+            food, grams, dict(zip(NUTRIENTS, values.tolist())), table, vitamins
+        )
@@ -0,0 +1,153 @@
+import json
+import threading
+import zlib
+from datetime import date, datetime
+
+
+class ConflictError(Exception):
+    """The stored state changed since it was read."""
+
+
+def _encode_value(value):
+    # JSON has no dates: tag them so they round-trip
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if hasattr(value, "item"):  # NumPy scalars
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode_value(obj):
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+def dumps(value):
+    # Canonical JSON text, equal for equal values
+    return json.dumps(
+        value, default=_encode_value, sort_keys=True, separators=(",", ":")
+    )
+
+
+def encode_state(state):
+    return zlib.compress(dumps(state).encode(), 6)
+
+
+def decode_state(data):
+    return json.loads(zlib.decompress(data), object_hook=_decode_value)
+
+
+class StateStore:
+    """Per-user state shared by every replica, with optimistic concurrency.
+
+    A user's state is a JSON-compatible dict (dates allowed) stored with a
+    version number, starting at 0 when nothing is stored. ``put`` only
+    succeeds if the version is still the one that was read, and raises
+    ConflictError otherwise; ``update`` wraps the read-modify-write loop.
+    Subclasses implement ``get`` and ``put``.
+    """
+
+    def get(self, user_id):
+        # (state, version) of one user
+        raise NotImplementedError
+
+    def put(self, user_id, state, expected_version):
+        # Store state if the version is still expected_version; the new version
+        raise NotImplementedError
+
+    def update(self, user_id, mutate, retries=8):
+        # Apply mutate(state) and store it, rereading on conflicts
+        for _ in range(retries):
+            state, version = self.get(user_id)
+            mutate(state)
+            try:
+                return state, self.put(user_id, state, version)
+            except ConflictError:
+                continue
+        raise ConflictError(f"State of {user_id!r} kept changing during update")
+
+
+class LocalStateStore(StateStore):
+    """In-process state store, for a single replica and for tests.
+
+    Entries are kept serialized, so callers never share mutable state.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            version, data = self._entries.get(user_id, (0, None))
+        return ({} if data is None else decode_state(data)), version
+
+    def put(self, user_id, state, expected_version):
+        data = encode_state(state)
+        with self._lock:
+            version = self._entries.get(user_id, (0, None))[0]
+            if version != expected_version:
+                raise ConflictError(user_id)
+            self._entries[user_id] = (version + 1, data)
+        return version + 1
+
+
+class RedisStateStore(StateStore):
+    """State store in Redis, shared by all replicas.
+
+    Takes a redis-py compatible client (``redis.Redis`` or a stand-in such
+    as ``fakeredis.FakeRedis``). Each user is one hash holding the version
+    and the compressed state; writes use WATCH/MULTI so a concurrent write
+    surfaces as ConflictError. Idle users expire after ``ttl`` seconds when
+    it is set.
+    """
+
+    def __init__(self, client, prefix="caltrack:state:", ttl=None):
+        from redis.exceptions import WatchError
+
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self._watch_error = WatchError
+
+    def get(self, user_id):
+        version, data = self.client.hmget(self.prefix + user_id, "version", "data")
+        if data is None:
+            return {}, 0
+        return decode_state(data), int(version)
+
+    def put(self, user_id, state, expected_version):
+        key = self.prefix + user_id
+        data = encode_state(state)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                if int(pipe.hget(key, "version") or 0) != expected_version:
+                    raise ConflictError(user_id)
+                pipe.multi()
+                pipe.hset(key, mapping={"version": expected_version + 1, "data": data})
+                if self.ttl:
+                    pipe.expire(key, self.ttl)
+                pipe.execute()
+            except self._watch_error:
+                raise ConflictError(user_id)
+        return expected_version + 1
+
+
+_local_store = LocalStateStore()
+
+
+def open_state_store(url=None):
+    """State store for a URL: in-process when empty, Redis for redis:// URLs."""
+    if not url or url == "local":
+        return _local_store
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        import redis
+
+        return RedisStateStore(redis.Redis.from_url(url))
+    raise ValueError(f"Unsupported state store URL: {url}")
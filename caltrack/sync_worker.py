@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+PENDING, RUNNING, RETRYING, DONE, FAILED = (
+    "pending",
+    "running",
+    "retrying",
+    "done",
+    "failed",
+)
+
+# Errors worth retrying: network failures, timeouts and malformed responses
+RETRYABLE_ERRORS = (OSError, TimeoutError, ValueError, KeyError)
+
+
+class SyncJob:
+    """State of one background device sync, safe to read from the page.
+
+    The worker thread updates ``status``, ``attempts``, ``samples`` and
+    ``error`` as it goes; the Streamlit script only reads them.
+    """
+
+    def __init__(self, retries, backoff):
+        self.retries = retries
+        self.backoff = backoff
+        self.status = PENDING
+        self.attempts = 0
+        self.samples = 0
+        self.error = None
+        self.started = datetime.now()
+        self.finished = None
+        self.applied = False  # Set by the page once the result has been used
+        self.future = None
+
+    @property
+    def active(self):
+        return self.status in (PENDING, RUNNING, RETRYING)
+
+    def _progress(self, samples):
+        self.samples = samples
+
+    def run(self, sync):
+        status = FAILED
+        try:
+            while True:
+                self.attempts += 1
+                self.status = RUNNING
+                try:
+                    # Keep counting across retries, a retry resumes from the
+                    # watermark
+                    done = self.samples
+                    sync(progress=lambda n: self._progress(done + n))
+                except RETRYABLE_ERRORS as error:
+                    self.error = f"{type(error).__name__}: {error}"
+                    if self.attempts > self.retries:
+                        break
+                    self.status = RETRYING
+                    time.sleep(self.backoff * 2 ** (self.attempts - 1))
+                else:
+                    self.error = None
+                    status = DONE
+                    break
+        except Exception as error:
+            # Not worth retrying, but the job must still finish
+            self.error = f"{type(error).__name__}: {error}"
+        finally:
+            # finished is set first, so a finished job always has it
+            self.finished = datetime.now()
+            self.status = status
+        return self
+
+
+class SyncWorker:
+    """Runs device syncs on a shared thread pool.
+
+    One pool serves every session in the process, so concurrent users never
+    wait on each other's network calls beyond ``max_workers`` running syncs.
+    """
+
+    def __init__(self, max_workers=8):
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tracker-sync"
+        )
+
+    def submit(self, tracker, retries=3, backoff=0.5, connect=False):
+        # Start syncing tracker in the background and return its SyncJob;
+        # with connect, the tracker is connected once the sync succeeds
+        job = SyncJob(retries, backoff)
+        sync = tracker.connect if connect else tracker.sync
+        job.future = self._pool.submit(job.run, sync)
+        return job
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,51 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from .activity_trends import TrendEngine
+from .tracker_ingest import DAILY_COLUMNS, HttpSource, SimulatedSource, TrackerIngestor
+
+
+def default_device_source():
+    # Talk to a device API when CALTRACK_DEVICE_URL is set, otherwise simulate
+    url = os.environ.get("CALTRACK_DEVICE_URL")
+    return HttpSource(url) if url else SimulatedSource()
+
+
+# Mock fitness tracker API
+class MockFitnessTracker:
+    def __init__(self, source=None, sink=None):
+        self.connected = False
+        self.ingestor = TrackerIngestor(source or default_device_source(), sink)
+        self.trends = TrendEngine()
+        self.data = pd.DataFrame(columns=DAILY_COLUMNS)
+
+    def connect(self, progress=None):
+        # Connected only once a first sync has reached the device
+        self.sync(progress=progress)
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+    def is_connected(self):
+        return self.connected
+
+    def sync(self, progress=None):
+        # Ingest samples recorded since the last sync
+        since = self.ingestor.watermark if len(self.trends) else None
+        try:
+            return self.ingestor.sync(progress=progress)
+        finally:
+            # Feed the trends only the days this sync touched
+            self.trends.update(self.ingestor.sink.daily(start=since and since.date()))
+
+    def get_data(self, days=7):
+        if not self.connected:
+            return None
+
+        # Daily rollups only, raw samples stay on disk
+        start_date = pd.Timestamp(datetime.now().date() - timedelta(days=days))
+        self.data = self.ingestor.sink.daily(start=start_date)
+        return self.data
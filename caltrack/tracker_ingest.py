@@ -0,0 +1,222 @@
+import json
+import threading
+import urllib.parse
+import urllib.request
+import zlib
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_COLUMNS = ["Timestamp", "Steps", "Heart Rate", "Calories"]
+DAILY_COLUMNS = [
+    "Date",
+    "Steps",
+    "Calories Burned",
+    "Active Minutes",
+    "Heart Rate",
+    "Resting Heart Rate",
+]
+
+ACTIVE_STEPS_PER_MINUTE = 60  # A minute counts as active at or above this cadence
+MINUTE = pd.Timedelta(minutes=1)
+
+
+class SimulatedSource:
+    """Stand-in for the device API producing minute-level samples.
+
+    Each day's samples are generated from a seed derived from the day, so
+    replaying any time range always yields the same values no matter how it
+    is split into syncs.
+    """
+
+    def __init__(self, seed=0, history_days=7, clock=pd.Timestamp.now):
+        self.seed = seed
+        self.history_days = history_days
+        self.clock = clock
+
+    def _day(self, day):
+        rng = np.random.default_rng([self.seed, zlib.crc32(day.isoformat().encode())])
+        hours = np.arange(1440) // 60
+        awake = (hours >= 7) & (hours < 23)
+        steps = rng.poisson(np.where(awake, 12.0, 0.2))
+        workout = rng.integers(6 * 60, 20 * 60)
+        steps[workout : workout + rng.integers(20, 70)] += rng.integers(80, 140)
+        heart_rate = 55 + 0.35 * steps + rng.normal(0, 3, 1440) + 8 * awake
+        calories = 1.1 + 0.045 * steps + 0.1 * awake
+        return pd.DataFrame(
+            {
+                "Timestamp": pd.date_range(day, periods=1440, freq="min"),
+                "Steps": steps,
+                "Heart Rate": heart_rate.round(),
+                "Calories": calories,
+            }
+        )
+
+    def read_since(self, watermark, chunk_size=10_000):
+        # Samples after the watermark up to now, one chunk per day at most
+        end = self.clock().floor("min")
+        start = (
+            watermark + MINUTE
+            if watermark is not None
+            else (end - pd.Timedelta(days=self.history_days)).normalize()
+        )
+        day = start.normalize()
+        while day <= end:
+            samples = self._day(day)
+            samples = samples[
+                (samples["Timestamp"] >= start) & (samples["Timestamp"] <= end)
+            ]
+            for first in range(0, len(samples), chunk_size):
+                yield samples.iloc[first : first + chunk_size]
+            day += pd.Timedelta(days=1)
+
+
+class ReplaySource:
+    """Replays minute-level samples recorded in a CSV file.
+
+    The file needs the SAMPLE_COLUMNS header and rows in time order; it is
+    streamed in chunks and only samples after the watermark are yielded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def read_since(self, watermark, chunk_size=10_000):
+        chunks = pd.read_csv(self.path, chunksize=chunk_size, parse_dates=["Timestamp"])
+        for chunk in chunks:
+            if watermark is not None:
+                chunk = chunk[chunk["Timestamp"] > watermark]
+            if len(chunk):
+                yield chunk[SAMPLE_COLUMNS]
+
+
+class HttpSource:
+    """Reads samples from a device API over HTTP.
+
+    ``GET {url}/samples?since=<ISO timestamp>&limit=<n>`` must answer with
+    ``{"columns": SAMPLE_COLUMNS, "data": [[...], ...]}`` holding at most
+    ``limit`` samples after ``since`` in time order; pages are requested
+    until a short one comes back. Network errors and timeouts propagate so
+    the caller can retry from the watermark.
+    """
+
+    def __init__(self, url, timeout=5.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _fetch(self, since, limit):
+        query = {"limit": limit}
+        if since is not None:
+            query["since"] = since.isoformat()
+        url = f"{self.url}/samples?{urllib.parse.urlencode(query)}"
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            payload = json.load(response)
+        chunk = pd.DataFrame(payload["data"], columns=payload["columns"])
+        chunk["Timestamp"] = pd.to_datetime(chunk["Timestamp"])
+        return chunk[SAMPLE_COLUMNS]
+
+    def read_since(self, watermark, chunk_size=10_000):
+        while True:
+            chunk = self._fetch(watermark, chunk_size)
+            if len(chunk):
+                yield chunk
+                watermark = chunk["Timestamp"].iloc[-1]
+            if len(chunk) < chunk_size:
+                return
+
+
+class DailyAggregates:
+    """Running per-day totals built incrementally from sample chunks.
+
+    Sums and counts are kept rather than means, so a day that arrives over
+    several syncs merges exactly. Samples at or before ``watermark``, the
+    latest timestamp seen, are dropped so replaying a chunk is harmless.
+    Hourly heart rate sums are kept too; the resting heart rate of a day is
+    its lowest hourly mean.
+    """
+
+    def __init__(self):
+        # Indexed by day and hour, even while empty, so ``daily`` can slice
+        # and normalize them before the first sample arrives
+        empty = pd.DatetimeIndex([], dtype="datetime64[ns]")
+        self._days = pd.DataFrame(
+            index=empty,
+            columns=["steps", "calories", "active", "hr_sum", "hr_count"],
+            dtype=float,
+        )
+        self._hours = pd.DataFrame(
+            index=empty, columns=["hr_sum", "hr_count"], dtype=float
+        )
+        self.watermark = None
+
+    def update(self, samples):
+        if self.watermark is not None:
+            samples = samples[samples["Timestamp"] > self.watermark]
+        if samples.empty:
+            return 0
+        minutes = pd.DataFrame(
+            {
+                "steps": samples["Steps"].to_numpy(dtype=float),
+                "calories": samples["Calories"].to_numpy(dtype=float),
+                "active": samples["Steps"].to_numpy() >= ACTIVE_STEPS_PER_MINUTE,
+                "hr_sum": samples["Heart Rate"].fillna(0).to_numpy(dtype=float),
+                "hr_count": samples["Heart Rate"].notna().to_numpy(dtype=float),
+            },
+            index=samples["Timestamp"].dt.normalize().to_numpy(),
+        )
+        daily = minutes.groupby(level=0).sum()
+        self._days = daily.add(self._days, fill_value=0).sort_index()
+        hourly = minutes[["hr_sum", "hr_count"]].groupby(
+            samples["Timestamp"].dt.floor("h").to_numpy()
+        )
+        self._hours = hourly.sum().add(self._hours, fill_value=0).sort_index()
+        self.watermark = samples["Timestamp"].max()
+        return len(samples)
+
+    def daily(self, start=None, end=None):
+        days = self._days.loc[start:end]
+        heart_rate = days["hr_sum"] / days["hr_count"].where(days["hr_count"] > 0)
+        hours = self._hours.loc[start:]
+        hourly_rate = hours["hr_sum"] / hours["hr_count"].where(hours["hr_count"] > 0)
+        resting = hourly_rate.groupby(hours.index.normalize()).min()
+        return pd.DataFrame(
+            {
+                "Date": days.index,
+                "Steps": days["steps"].round().astype(int).to_numpy(),
+                "Calories Burned": days["calories"].round().astype(int).to_numpy(),
+                "Active Minutes": days["active"].astype(int).to_numpy(),
+                "Heart Rate": heart_rate.round().to_numpy(),
+                "Resting Heart Rate": resting.reindex(days.index).round().to_numpy(),
+            }
+        )
+
+
+class TrackerIngestor:
+    """Pulls new samples from a source into a sink of daily aggregates.
+
+    The sink keeps the watermark, the timestamp of the last ingested sample,
+    so each sync only reads and aggregates samples that arrived since. The
+    watermark advances per chunk, so a sync that fails halfway resumes where
+    it stopped. Syncs of one ingestor are serialized; ``progress`` is called
+    with the running sample count after each chunk.
+    """
+
+    def __init__(self, source, sink=None):
+        self.source = source
+        self.sink = sink if sink is not None else DailyAggregates()
+        self._lock = threading.Lock()
+
+    @property
+    def watermark(self):
+        return self.sink.watermark
+
+    def sync(self, chunk_size=10_000, progress=None):
+        ingested = 0
+        with self._lock:
+            for chunk in self.source.read_since(self.watermark, chunk_size):
+                if chunk.empty:
+                    continue
+                ingested += self.sink.update(chunk)
+                if progress is not None:
+                    progress(ingested)
+        return ingested
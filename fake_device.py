@@ -0,0 +1,122 @@
+"""Local fake of a fitness tracker API for trying out device syncs.
+
+Serves the samples of a SimulatedSource in the format HttpSource expects:
+
+    python fake_device.py --port 8765 --latency 0.5 --failure-rate 0.2
+    CALTRACK_DEVICE_URL=http://127.0.0.1:8765 streamlit run app.py
+
+``--latency`` delays every response and ``--failure-rate`` answers that
+fraction of requests with HTTP 503, to exercise timeouts and retries;
+``--fail-first`` fails the first requests instead, for repeatable runs.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from caltrack.tracker_ingest import SAMPLE_COLUMNS, SimulatedSource
+
+
+class FakeDeviceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, address, source=None, latency=0.0, failure_rate=0.0, fail_first=0
+    ):
+        super().__init__(address, _Handler)
+        self.source = source or SimulatedSource()
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fail_first = fail_first
+        self.requests = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def samples(self, since, limit):
+        chunks = []
+        remaining = limit
+        for chunk in self.source.read_since(since, chunk_size=limit):
+            chunks.append(chunk.iloc[:remaining])
+            remaining -= len(chunks[-1])
+            if remaining <= 0:
+                break
+        if not chunks:
+            return pd.DataFrame(columns=SAMPLE_COLUMNS)
+        return pd.concat(chunks)
+
+    def start(self):
+        # Serve from a daemon thread, handy in tests and notebooks
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        url = urlparse(self.path)
+        if url.path != "/samples":
+            self.send_error(404)
+            return
+        time.sleep(server.latency)
+        if (
+            server.requests <= server.fail_first
+            or random.random() < server.failure_rate
+        ):
+            self.send_error(503, "Device temporarily unavailable")
+            return
+
+        query = parse_qs(url.query)
+        since = query.get("since", [None])[0]
+        since = pd.Timestamp(since) if since else None
+        limit = int(query.get("limit", ["10000"])[0])
+        samples = server.samples(since, limit)
+
+        body = json.dumps(
+            {
+                "columns": SAMPLE_COLUMNS,
+                "data": [
+                    [t.isoformat(), int(steps), float(hr), float(calories)]
+                    for t, steps, hr, calories in samples.itertuples(index=False)
+                ],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--fail-first", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeDeviceServer(
+        (args.host, args.port),
+        SimulatedSource(seed=args.seed),
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        fail_first=args.fail_first,
+    )
+    print(f"Fake device listening on {server.url}")
+    server.serve_forever()
@@ -0,0 +1,45 @@
+"""Import food composition files into a catalog snapshot for the app.
+
+Streams CSV, JSON Lines or JSON array files (for example USDA FoodData
+Central downloads) in chunks and writes a memory-mapped snapshot:
+
+    python import_foods.py branded_food.csv.gz foundation.json --out foods
+    CALTRACK_FOODS=foods streamlit run app.py
+
+The built-in foods are imported first unless ``--no-builtin`` is given.
+Nutrients are read as per 100 g; with ``--per-serving`` they are taken per
+serving and scaled using the serving size columns.
+"""
+
+import argparse
+import time
+
+from caltrack.food_import import database_frame, import_foods
+from caltrack.foods import FOOD_DATABASE
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="CSV, JSON Lines or JSON files")
+    parser.add_argument("--out", default="foods", help="snapshot directory")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--per-serving", action="store_true")
+    parser.add_argument("--no-builtin", action="store_true")
+    args = parser.parse_args()
+
+    def report(stats):
+        print(
+            f"\r{stats.read:,} read, {stats.imported:,} imported, "
+            f"{stats.duplicates:,} duplicates, {stats.skipped:,} skipped",
+            end="",
+            flush=True,
+        )
+
+    sources = list(args.paths)
+    if not args.no_builtin:
+        sources.insert(0, database_frame(FOOD_DATABASE))
+    start = time.perf_counter()
+    stats = import_foods(
+        sources, args.out, args.chunk_size, args.per_serving, progress=report
+    )
+    report(stats)
+    print(f"\nWrote {args.out} in {time.perf_counter() - start:.1f} s")
@@ -0,0 +1,31 @@
+from caltrack.memo import LRUCache
+
+
+def test_entries_expire_after_ttl():
+    now = [0.0]
+    cache = LRUCache(ttl=10, clock=lambda: now[0])
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    now[0] = 5
+    assert cache.get_or_compute("a", lambda: 2) == 1
+    now[0] = 15
+    assert cache.get_or_compute("a", lambda: 3) == 3
+    assert cache.expirations == 1
+
+
+def test_without_ttl_entries_stay():
+    now = [0.0]
+    cache = LRUCache(clock=lambda: now[0])
+    cache.get_or_compute("a", lambda: 1)
+    now[0] = 1e9
+    assert cache.get_or_compute("a", lambda: 2) == 1
+
+
+def test_cost_cap_evicts_least_recently_used():
+    cache = LRUCache(max_cost=100)
+    cache.get_or_compute("a", lambda: "a", cost=40)
+    cache.get_or_compute("b", lambda: "b", cost=40)
+    cache.get_or_compute("a", lambda: "a2")
+    cache.get_or_compute("c", lambda: "c", cost=40)
+    assert len(cache) == 2 and cache.cost == 80
+    assert cache.get_or_compute("a", lambda: "a3") == "a"
+    assert cache.get_or_compute("b", lambda: "b2") == "b2"
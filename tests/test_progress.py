@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from caltrack.chart_data import downsample
+from caltrack.goals import overall_changes
+from caltrack.progress_store import PROGRESS_COLUMNS
+
+
+def progress_frame(rows):
+    frame = pd.DataFrame(rows, columns=PROGRESS_COLUMNS)
+    frame["Date"] = pd.to_datetime(frame["Date"])
+    return frame
+
+
+def test_changes_skip_entries_without_weight():
+    frame = progress_frame(
+        [
+            ("2024-01-01", 80.0, 20.0, 90.0, 100.0, 30.0, 55.0),
+            ("2024-01-08", 79.0, 19.5, 89.0, 100.0, 30.0, 55.0),
+            # Measurements only
+            ("2024-01-15", np.nan, 19.0, 88.0, 101.0, 31.0, 54.0),
+        ]
+    )
+    changes = overall_changes(frame)
+    assert changes["Weight"] == -1.0
+    assert changes["Waist"] == -2.0
+    assert not any(np.isnan(v) for v in changes.values())
+
+
+def test_changes_need_two_values():
+    frame = progress_frame(
+        [
+            ("2024-01-01", 80.0, 20.0, 90.0, 100.0, 30.0, 55.0),
+            ("2024-01-08", np.nan, 19.5, 89.0, 100.0, 30.0, 55.0),
+            ("2024-01-15", 0.0, 19.0, 88.0, 101.0, 31.0, 54.0),
+        ]
+    )
+    changes = overall_changes(frame)
+    assert "Weight" not in changes
+    assert changes["Body Fat %"] == -1.0
+
+
+def test_downsample_drops_missing_values():
+    dates = pd.date_range("2024-01-01", periods=5000, freq="h")
+    weight = np.linspace(90, 80, len(dates))
+    weight[::3] = np.nan
+    frame = pd.DataFrame({"Date": dates, "Weight": weight})
+    kept = downsample(frame, "Date", "Weight", max_points=100)
+    assert len(kept) == 100
+    assert kept["Weight"].notna().all()
+    assert kept["Date"].iloc[0] == dates[1]
+    assert kept["Date"].iloc[-1] == dates[-1]
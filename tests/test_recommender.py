@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from caltrack.food_catalog import FoodCatalog
+from caltrack.foods import FOOD_DATABASE
+from caltrack.recommender import MealRecommender
+
+
+def test_cached_recommendations_are_read_only():
+    recommender = MealRecommender(FoodCatalog.from_dict(FOOD_DATABASE))
+    meals = recommender.recommend("Balanced", 2000)
+    best = meals["Lunch"][0]
+    totals = best.totals.copy()
+
+    with pytest.raises(ValueError):
+        best.totals[0] = 0
+    with pytest.raises(TypeError):
+        meals["Lunch"] = ()
+    assert isinstance(best.foods, tuple)
+
+    again = recommender.recommend("Balanced", 2000)
+    np.testing.assert_array_equal(again["Lunch"][0].totals, totals)
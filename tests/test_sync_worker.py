@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from caltrack.sync_worker import DONE, FAILED, SyncWorker
+from caltrack.tracker import MockFitnessTracker
+from caltrack.tracker_ingest import DailyAggregates, HttpSource, SimulatedSource
+from fake_device import FakeDeviceServer
+
+NOW = pd.Timestamp("2024-03-02 00:00")
+
+
+@pytest.fixture
+def worker():
+    worker = SyncWorker(max_workers=1)
+    yield worker
+    worker.shutdown()
+
+
+@pytest.fixture
+def device():
+    servers = []
+
+    def start(**options):
+        source = SimulatedSource(history_days=1, clock=lambda: NOW)
+        server = FakeDeviceServer(("127.0.0.1", 0), source, **options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_retries_until_the_device_answers(worker, device):
+    server = device(fail_first=2)
+    tracker = MockFitnessTracker(HttpSource(server.url, timeout=2))
+    job = worker.submit(tracker, retries=3, backoff=0)
+    job.future.result(timeout=10)
+
+    assert job.status == DONE
+    assert job.attempts == 3
+    assert job.error is None
+    assert job.samples == 1441
+    assert tracker.ingestor.sink.daily()["Steps"].sum() > 0
+
+
+def test_fails_once_retries_run_out(worker, device):
+    server = device(fail_first=10)
+    tracker = MockFitnessTracker(HttpSource(server.url, timeout=2))
+    job = worker.submit(tracker, retries=2, backoff=0, connect=True)
+    job.future.result(timeout=10)
+
+    assert job.status == FAILED
+    assert job.attempts == 3
+    assert "HTTPError" in job.error
+    assert job.finished is not None
+    assert not tracker.is_connected()
+
+
+class BrokenSink(DailyAggregates):
+    def update(self, samples):
+        raise RuntimeError("sink is read-only")
+
+
+def test_other_errors_fail_without_retrying(worker, device):
+    server = device()
+    tracker = MockFitnessTracker(HttpSource(server.url, timeout=2), BrokenSink())
+    job = worker.submit(tracker, retries=3, backoff=0)
+    job.future.result(timeout=10)
+
+    assert job.status == FAILED
+    assert job.attempts == 1
+    assert job.error == "RuntimeError: sink is read-only"
+    assert not job.active
@@ -0,0 +1,21 @@
+"""Streamlit pages of CalTrack Pro, imported on first visit.
+
+Each page module exposes ``render()``. Keeping them out of app.py means a
+session only pays for the libraries of the pages it opens; Home, for
+instance, never imports pandas or plotly.
+"""
+
+import importlib
+
+# Sidebar label -> page module
+PAGES = {
+    "Home": "views.home",
+    "Meal Planner": "views.meal_planner",
+    "Nutrient Analysis": "views.nutrients",
+    "Progress Tracking": "views.progress",
+    "Fitness Tracker Integration": "views.fitness",
+}
+
+
+def render(page):
+    importlib.import_module(PAGES[page]).render()
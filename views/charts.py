@@ -0,0 +1,51 @@
+import pandas as pd
+import plotly.express as px
+
+from caltrack.chart_data import MAX_POINTS, downsample, frame_key
+from caltrack.memo import LRUCache
+from views.profiling import section
+
+
+class FigureCache(LRUCache):
+    """LRU cache of Plotly figures with an approximate memory cap.
+
+    Each entry is charged the size of the data it plots plus a fixed
+    overhead; least recently used figures are evicted once ``max_bytes`` or
+    ``max_entries`` is exceeded. Safe to share between sessions.
+    """
+
+    ENTRY_OVERHEAD = 16 * 1024
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=256):
+        super().__init__(maxsize=max_entries, max_cost=max_bytes)
+
+    def get_or_build(self, key, build, cost):
+        return self.get_or_compute(key, build, cost + self.ENTRY_OVERHEAD)
+
+
+FIGURE_CACHE = FigureCache()
+
+
+def line_chart(frame, x, y, title, max_points=MAX_POINTS, cache=FIGURE_CACHE):
+    data = frame[[x, y]]
+    key = frame_key(data, "line", x, y, title, max_points)
+
+    def build():
+        with section("figure"):
+            return px.line(downsample(data, x, y, max_points), x=x, y=y, title=title)
+
+    cost = int(data.memory_usage(index=False).sum())
+    if max_points is not None:
+        cost = min(cost, max_points * 16)
+    return cache.get_or_build(key, build, cost)
+
+
+def pie_chart(values, names, title, cache=FIGURE_CACHE):
+    data = pd.DataFrame({"names": list(names), "values": list(values)})
+    key = frame_key(data, "pie", title)
+
+    def build():
+        with section("figure"):
+            return px.pie(values=data["values"], names=data["names"], title=title)
+
+    return cache.get_or_build(key, build, int(data.memory_usage(deep=True).sum()))
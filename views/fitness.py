@@ -0,0 +1,212 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from caltrack.activity_trends import TREND_METRICS
+from caltrack.energy import TdeeEstimator
+from caltrack.goals import energy_inputs
+from caltrack.sync_worker import FAILED
+from views.charts import line_chart
+from views.profiling import PROFILER, section
+from views.resources import fitness_tracker, progress_window, sync_worker
+
+ACTIVITY_WINDOWS = {"Last 7 days": 7, "Last 30 days": 30, "Last year": 365}
+
+
+def render():
+    st.header("Fitness Tracker Integration")
+
+    # Tabs for different features
+    tabs = st.tabs(["Connect Device", "Activity Dashboard", "Sync Data"])
+
+    with tabs[0], section("connect"):
+        connect_device()
+
+    with tabs[1], section("dashboard"):
+        activity_dashboard()
+
+    with tabs[2], section("sync"):
+        sync_data()
+
+
+def connect_device():
+    st.subheader("Connect Your Fitness Tracker")
+
+    if fitness_tracker().is_connected():
+        st.success("Your fitness tracker is connected!")
+        if st.button("Disconnect Device"):
+            fitness_tracker().disconnect()
+            st.rerun()
+        return
+
+    # Connecting runs a first sync on the worker, like "Sync Now"
+    job = st.session_state.get("connect_job")
+    connecting = job is not None and job.active
+    if job is not None and job.status == FAILED:
+        st.error(f"Could not connect after {job.attempts} attempts: {job.error}")
+    else:
+        st.warning("No fitness tracker connected.")
+    if st.button("Connect Device", disabled=connecting):
+        st.session_state.connect_job = sync_worker().submit(
+            fitness_tracker(), connect=True
+        )
+        connecting = True
+    if connecting:
+        sync_progress("connect_job")
+
+
+def activity_dashboard():
+    st.subheader("Activity Dashboard")
+
+    if not fitness_tracker().is_connected():
+        st.warning("Please connect your fitness tracker to view the dashboard.")
+        return
+
+    window = st.selectbox("Time range:", list(ACTIVITY_WINDOWS), key="activity_window")
+    days = ACTIVITY_WINDOWS[window]
+
+    # Get data from the mock fitness tracker
+    with section("daily data"):
+        data = fitness_tracker().get_data(days)
+
+    if data is None or data.empty:
+        st.warning("No data available. Please sync your device.")
+        return
+
+    # Display summary statistics
+    st.write(f"Summary ({window}):")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Avg. Daily Steps", f"{data['Steps'].mean():.0f}")
+    with col2:
+        st.metric("Avg. Calories Burned", f"{data['Calories Burned'].mean():.0f}")
+    with col3:
+        st.metric("Avg. Active Minutes", f"{data['Active Minutes'].mean():.0f}")
+
+    start = datetime.now().date() - timedelta(days=days)
+    with section("trends"):
+        trends = fitness_tracker().trends.frame(start)
+    if not trends.empty:
+        latest = trends.iloc[-1]
+        st.write("Trends (7-day average, change from the week before):")
+        columns = st.columns(len(TREND_METRICS) + 2)
+        for column, metric in zip(columns, TREND_METRICS):
+            change = latest[f"{metric} WoW %"]
+            column.metric(
+                metric,
+                f"{latest[f'{metric} 7d Avg']:.0f}",
+                None if np.isnan(change) else f"{change:+.1f}%",
+            )
+        columns[-2].metric(
+            "Workload Ratio",
+            f"{latest['Workload Ratio']:.2f}",
+            help="7-day over 28-day average active minutes. "
+            "Between 0.8 and 1.3 is a steady build-up.",
+        )
+        baseline = latest["Resting HR Baseline"]
+        rest_change = latest["Resting Heart Rate"] - baseline
+        columns[-1].metric(
+            "Resting HR Baseline",
+            f"{baseline:.0f} bpm",
+            None if np.isnan(rest_change) else f"{rest_change:+.0f} bpm today",
+            delta_color="inverse",
+        )
+
+    # Create line charts
+    metrics = ["Steps", "Calories Burned", "Active Minutes", "Heart Rate"]
+    for metric in metrics:
+        fig = line_chart(data, "Date", metric, f"{metric} Over Time")
+        st.plotly_chart(fig)
+
+    if not trends.empty:
+        for metric in ["Steps 7d Avg", "Workload Ratio", "Resting Heart Rate"]:
+            fig = line_chart(trends, "Date", metric, f"{metric} Over Time")
+            st.plotly_chart(fig)
+
+
+def sync_data():
+    st.subheader("Sync Fitness Data")
+
+    if not fitness_tracker().is_connected():
+        st.warning("Please connect your fitness tracker to sync data.")
+        return
+
+    job = st.session_state.get("sync_job")
+    if st.button("Sync Now", disabled=job is not None and job.active):
+        job = sync_worker().submit(fitness_tracker())
+        st.session_state.sync_job = job
+
+    if job is not None and job.active:
+        sync_progress("sync_job")
+    elif job is not None:
+        if not job.applied:
+            apply_sync(job)
+        if job.status == FAILED:
+            st.error(f"Sync failed after {job.attempts} attempts: {job.error}")
+        else:
+            st.success(f"Data synced successfully! {job.samples:,} new samples.")
+
+    if "calorie_goal" in st.session_state:
+        st.write(
+            f"Current daily calorie goal: {st.session_state.calorie_goal} calories"
+        )
+
+    # Display sync history (for demonstration, we'll just show the last sync time)
+    if st.session_state.get("last_sync"):
+        st.write(f"Last synced: {st.session_state.last_sync}")
+
+    st.write("This feature is under development. Check back soon!")
+
+
+@st.fragment(run_every=1)
+def sync_progress(key):
+    # Polls the background sync in session state key without blocking the
+    # rest of the page
+    job = st.session_state[key]
+    if job.active:
+        retry = f" (attempt {job.attempts})" if job.attempts > 1 else ""
+        st.info(f"Syncing data{retry}... {job.samples:,} samples received")
+    else:
+        st.rerun()
+
+
+def apply_sync(job):
+    job.applied = True
+    # The sync itself ran on a worker thread, outside this page's sections
+    PROFILER.observe("sync job", (job.finished - job.started).total_seconds())
+    if job.status == FAILED:
+        return
+
+    # Update calorie goal from the estimated energy expenditure
+    st.session_state.calorie_goal = int(round(update_tdee_estimate(), -1))
+    st.session_state.last_sync = job.finished.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def update_tdee_estimate():
+    # Step the TDEE filter through the days completed since the last update;
+    # its state is kept as plain lists so it persists with the user's state
+    if "tdee_state" in st.session_state:
+        estimator = TdeeEstimator.from_state(st.session_state.tdee_state)
+    else:
+        estimator = TdeeEstimator(st.session_state.get("tdee", 2000))
+        st.session_state.tdee_next_day = None
+    first = st.session_state.tdee_next_day
+    last = pd.Timestamp(datetime.now().date()) - pd.Timedelta(days=1)
+
+    burned = fitness_tracker().ingestor.sink.daily(first, last)
+    if first is None:
+        first = burned["Date"].min() if len(burned) else last
+    days = energy_inputs(
+        first,
+        last,
+        burned,
+        progress_window(first),
+        st.session_state.get("intake_log", {}),
+    )
+    if len(days):
+        estimator.run(days[:, 0:1], days[:, 1:2], days[:, 2:3])
+    st.session_state.tdee_state = estimator.state()
+    st.session_state.tdee_next_day = last + pd.Timedelta(days=1)
+    return float(estimator.tdee[0])
@@ -0,0 +1,52 @@
+import streamlit as st
+
+from caltrack.energy import ACTIVITY_LEVELS, GENDERS, calculate_bmr, calculate_tdee
+
+
+def render():
+    st.header("Welcome to CalTrack Pro")
+    st.write("Track your calories, plan your meals, and achieve your health goals!")
+
+    # User profile, starting from the one saved on a previous visit
+    st.subheader("Your Profile")
+    profile = st.session_state.get("profile", {})
+    age = st.number_input(
+        "Age", min_value=1, max_value=120, value=profile.get("age", 30)
+    )
+    gender = st.selectbox(
+        "Gender", GENDERS, index=GENDERS.index(profile.get("gender", "Male"))
+    )
+    weight = st.number_input(
+        "Weight (kg)",
+        min_value=1.0,
+        max_value=300.0,
+        value=profile.get("weight", 70.0),
+    )
+    height = st.number_input(
+        "Height (cm)",
+        min_value=1.0,
+        max_value=300.0,
+        value=profile.get("height", 170.0),
+    )
+    activity_level = st.selectbox(
+        "Activity Level",
+        ACTIVITY_LEVELS,
+        index=ACTIVITY_LEVELS.index(profile.get("activity_level", "Sedentary")),
+    )
+
+    # Calculate BMR and TDEE
+    bmr = calculate_bmr(age, gender, weight, height)
+    tdee = calculate_tdee(bmr, activity_level)
+
+    st.write(f"Your Basal Metabolic Rate (BMR): {bmr:.2f} calories/day")
+    st.write(f"Your Total Daily Energy Expenditure (TDEE): {tdee:.2f} calories/day")
+    # Starting point for the adaptive estimate refined on each tracker sync
+    st.session_state.tdee = tdee
+    # Sets the reference intakes of the daily coverage analysis
+    st.session_state.profile = {
+        "age": age,
+        "gender": gender,
+        "weight": weight,
+        "height": height,
+        "activity_level": activity_level,
+    }
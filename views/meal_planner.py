@@ -0,0 +1,251 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from caltrack.food_catalog import MACROS
+from caltrack.meal_solver import MEAL_RATIOS, suggest_day_plan, within_tolerance
+from caltrack.nutrition_engine import MEALS, RunningTotals, as_dict
+from caltrack.recipes import Recipe, cooked_weight
+from views.profiling import section
+from views.resources import DEBUG, SEARCH_LIMIT, catalog, recipe_book, search_index
+
+
+def render():
+    st.header("Personalized Meal Planner")
+
+    # Get user's daily calorie goal
+    calorie_goal = st.number_input(
+        "Your daily calorie goal",
+        min_value=1000,
+        max_value=5000,
+        value=min(max(st.session_state.get("calorie_goal", 2000), 1000), 5000),
+    )
+
+    # Initialize session state for meal plan if it doesn't exist
+    if "meal_plan" not in st.session_state:
+        st.session_state.meal_plan = {meal: [] for meal in MEALS}
+
+    # Recipes are rows of the book's catalog, so plans use them like foods
+    book = recipe_book()
+    recipe_editor(book)
+
+    # Create tabs for each meal
+    tabs = st.tabs(list(MEALS))
+
+    if "meal_totals" not in st.session_state:
+        st.session_state.meal_totals = RunningTotals.from_plan(
+            book.catalog, st.session_state.meal_plan
+        )
+    totals = st.session_state.meal_totals
+
+    # Function to add food to a meal
+    def add_food(meal):
+        query = st.text_input(f"Search foods for {meal}", key=f"{meal}_search")
+        recipes = [name for name in book.names if query.lower() in name.lower()]
+        food = st.selectbox(
+            f"Select food for {meal}",
+            options=recipes + search_index().search_names(query, SEARCH_LIMIT),
+            key=f"{meal}_food",
+        )
+        amount = st.number_input(
+            f"Amount (grams) for {meal}",
+            min_value=1,
+            max_value=1000,
+            value=100,
+            key=f"{meal}_amount",
+        )
+        if food is None:
+            st.write("No foods match your search.")
+        elif st.button(f"Add to {meal}", key=f"{meal}_add"):
+            st.session_state.meal_plan[meal].append((food, amount))
+            totals.add(meal, food, amount)
+            st.rerun()
+
+    # Function to remove food from a meal
+    def remove_food(meal, index):
+        food, amount = st.session_state.meal_plan[meal].pop(index)
+        totals.remove(meal, food, amount)
+        st.rerun()
+
+    # Running totals are kept up to date by add_food/remove_food
+    per_meal, day_totals = totals.per_meal, totals.day
+    if DEBUG and not totals.check(st.session_state.meal_plan):
+        st.error("Meal totals are out of sync with the meal plan.")
+
+    # Display meal planner for each meal
+    for i, meal in enumerate(MEALS):
+        with tabs[i]:
+            add_food(meal)
+            st.write(f"Your {meal} plan:")
+            for idx, (food, amount) in enumerate(st.session_state.meal_plan[meal]):
+                st.write(f"- {food}: {amount}g")
+                if st.button(f"Remove {food}", key=f"{meal}_remove_{idx}"):
+                    remove_food(meal, idx)
+
+            meal_nutrition = as_dict(per_meal[i], MACROS)
+            st.write(f"{meal} nutritional information:")
+            st.write(f"Calories: {meal_nutrition['calories']:.1f}")
+            st.write(f"Protein: {meal_nutrition['protein']:.1f}g")
+            st.write(f"Carbs: {meal_nutrition['carbs']:.1f}g")
+            st.write(f"Fat: {meal_nutrition['fat']:.1f}g")
+
+    # Display total daily nutrition
+    total_nutrition = as_dict(day_totals, MACROS)
+    # Today's planned intake feeds the adaptive calorie goal
+    intake_log = st.session_state.setdefault("intake_log", {})
+    if total_nutrition["calories"] > 0:
+        intake_log[datetime.now().date().isoformat()] = total_nutrition["calories"]
+
+    st.header("Daily Totals")
+    st.write(f"Total Calories: {total_nutrition['calories']:.1f} / {calorie_goal}")
+    st.write(f"Total Protein: {total_nutrition['protein']:.1f}g")
+    st.write(f"Total Carbs: {total_nutrition['carbs']:.1f}g")
+    st.write(f"Total Fat: {total_nutrition['fat']:.1f}g")
+
+    # Progress bar for calorie goal
+    progress = total_nutrition["calories"] / calorie_goal
+    st.progress(min(progress, 1.0))
+    if progress < 1.0:
+        st.write(
+            f"You have {calorie_goal - total_nutrition['calories']:.1f} calories left for the day."
+        )
+    elif progress > 1.0:
+        st.write(
+            f"You've exceeded your calorie goal by {total_nutrition['calories'] - calorie_goal:.1f} calories."
+        )
+
+    # Meal plan suggestions
+    if st.button("Suggest a meal plan"):
+        with section("suggest plan"):
+            suggest_meal_plan(calorie_goal)
+
+
+def recipe_editor(book):
+    with st.expander("My Recipes"):
+        for name, recipe in book.recipes.items():
+            items = ", ".join(
+                f"{grams:g}g {food}" for food, grams in recipe.ingredients
+            )
+            per_100g = as_dict(book.per_100g(name), MACROS)
+            st.write(f"**{name}** ({cooked_weight(recipe):.0f}g cooked): {items}")
+            st.caption(
+                f"Per 100g: {per_100g['calories']:.0f} calories, "
+                f"Protein: {per_100g['protein']:.1f}g, "
+                f"Carbs: {per_100g['carbs']:.1f}g, Fat: {per_100g['fat']:.1f}g"
+            )
+            if st.button(f"Delete {name}", key=f"recipe_delete_{name}"):
+                planned = any(
+                    food == name
+                    for items in st.session_state.meal_plan.values()
+                    for food, _ in items
+                )
+                if planned:
+                    st.error(f"Remove {name} from your meal plan first.")
+                else:
+                    try:
+                        book.remove(name)
+                    except ValueError as error:
+                        st.error(str(error))
+                    else:
+                        save_recipes(book)
+
+        st.write("Create a recipe, or update one by entering its name:")
+        name = st.text_input("Recipe name", key="recipe_name").strip()
+
+        # Ingredients are picked from search results, like foods for a meal,
+        # and collected in a draft that the editor below can change
+        draft = st.session_state.setdefault("recipe_draft", [])
+        edited = st.data_editor(
+            pd.DataFrame(draft, columns=["Ingredient", "Grams"]),
+            num_rows="dynamic",
+            column_config={
+                "Ingredient": st.column_config.TextColumn(required=True),
+                "Grams": st.column_config.NumberColumn(min_value=1, max_value=5000),
+            },
+            key=f"recipe_ingredients_{len(draft)}",
+        )
+        items = [
+            (food, grams)
+            for food, grams in edited.itertuples(index=False)
+            if isinstance(food, str) and grams and grams > 0
+        ]
+
+        query = st.text_input("Search ingredients", key="recipe_search")
+        recipes = [r for r in book.names if query.lower() in r.lower()]
+        food = st.selectbox(
+            "Ingredient",
+            options=recipes + search_index().search_names(query, SEARCH_LIMIT),
+            key="recipe_food",
+        )
+        grams = st.number_input(
+            "Amount (grams)", min_value=1, max_value=5000, value=100, key="recipe_grams"
+        )
+        if food is None:
+            st.write("No foods match your search.")
+        elif st.button("Add ingredient", key="recipe_add"):
+            st.session_state.recipe_draft = [list(item) for item in items]
+            st.session_state.recipe_draft.append([food, grams])
+            st.rerun()
+
+        cooked = st.number_input(
+            "Cooked weight (grams, 0 if not weighed)",
+            min_value=0,
+            max_value=20000,
+            value=0,
+            key="recipe_cooked",
+        )
+        loss = st.slider(
+            "Cooking loss (% of raw weight, if not weighed)",
+            0,
+            90,
+            0,
+            key="recipe_loss",
+        )
+        if st.button("Save recipe", key="recipe_save"):
+            unknown = [food for food, _ in items if food not in book.catalog]
+            if not name:
+                st.error("Please name the recipe.")
+            elif unknown:
+                st.error(f"Unknown ingredients: {', '.join(unknown)}")
+            else:
+                try:
+                    book.add(Recipe(name, items, cooked or None, loss / 100))
+                except ValueError as error:
+                    st.error(str(error))
+                else:
+                    st.session_state.recipe_draft = []
+                    save_recipes(book)
+
+
+def save_recipes(book):
+    # Plans may hold the changed recipes, so their totals are rebuilt
+    st.session_state.recipes = book.to_dict()
+    st.session_state.pop("meal_totals", None)
+    st.rerun()
+
+
+def suggest_meal_plan(calorie_goal):
+    st.subheader("Suggested Meal Plan")
+
+    with section("solve"):
+        plan = suggest_day_plan(catalog(), calorie_goal)
+    for meal, ratio in MEAL_RATIOS.items():
+        st.write(f"{meal} (Target: {calorie_goal * ratio:.0f} calories):")
+
+        suggestion = plan[meal]
+        if suggestion is None:
+            st.write("No suitable foods found.")
+            continue
+
+        for food, amount in suggestion.foods:
+            st.write(f"- {food}: {amount}g")
+
+        calories, protein, carbs, fat = suggestion.totals
+        st.write(
+            f"Total calories: {calories:.0f} "
+            f"(Protein: {protein:.0f}g, Carbs: {carbs:.0f}g, Fat: {fat:.0f}g)"
+        )
+        if not within_tolerance(suggestion.totals, suggestion.target):
+            st.write("Closest match available; some targets are off by more than 10%.")
+        st.write("")
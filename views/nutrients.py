@@ -0,0 +1,248 @@
+import pandas as pd
+import streamlit as st
+
+from caltrack.coverage import day_coverage, gaps, reference_intakes
+from caltrack.food_catalog import NUTRIENTS
+from caltrack.nutrition_engine import plan_arrays, plan_nutrition
+from caltrack.recommender import describe
+from views.charts import pie_chart
+from views.profiling import section
+from views.resources import (
+    DEBUG,
+    SEARCH_LIMIT,
+    cache_stats,
+    density_index,
+    recipe_book,
+    recommender,
+    reference,
+    search_index,
+)
+
+# Educational topics, built once per process
+EDUCATION_TOPICS = {
+    "Understanding Macronutrients": """
+        Macronutrients are the nutrients that your body needs in large amounts:
+
+        1. Proteins: Essential for building and repairing tissues.
+        2. Carbohydrates: The body's main source of energy.
+        3. Fats: Important for nutrient absorption, nerve transmission, and maintaining cell membranes.
+
+        A balanced diet typically includes all three macronutrients in appropriate proportions.
+        """,
+    "The Importance of Micronutrients": """
+        Micronutrients are vitamins and minerals that your body needs in smaller amounts:
+
+        - Vitamins: Organic compounds needed for various bodily functions.
+        - Minerals: Inorganic elements that play crucial roles in bodily processes.
+
+        While needed in smaller quantities, micronutrients are essential for overall health and well-being.
+        """,
+    "Healthy Eating Habits": """
+        Developing healthy eating habits is crucial for maintaining good health:
+
+        1. Eat a variety of foods from all food groups.
+        2. Control portion sizes.
+        3. Choose whole grains over refined grains.
+        4. Include plenty of fruits and vegetables in your diet.
+        5. Limit processed foods and added sugars.
+        6. Stay hydrated by drinking plenty of water.
+        7. Practice mindful eating.
+        """,
+    "Reading Nutrition Labels": """
+        Understanding nutrition labels can help you make informed food choices:
+
+        1. Check the serving size and servings per container.
+        2. Look at the calorie content.
+        3. Pay attention to the % Daily Value (%DV).
+        4. Limit saturated fats, trans fats, cholesterol, and sodium.
+        5. Ensure you're getting enough fiber, vitamins, and minerals.
+        6. Check the ingredient list for added sugars and unhealthy additives.
+        """,
+    "The Role of Fiber in Diet": """
+        Fiber is a type of carbohydrate that the body can't digest. It's important because it:
+
+        1. Promotes regular bowel movements and prevents constipation.
+        2. Helps maintain bowel health.
+        3. Lowers cholesterol levels.
+        4. Helps control blood sugar levels.
+        5. Aids in achieving a healthy weight.
+
+        Good sources of fiber include fruits, vegetables, whole grains, and legumes.
+        """,
+}
+
+
+def render():
+    st.header("Nutrient Analysis")
+
+    # Tabs for different features
+    tabs = st.tabs(
+        [
+            "Nutrient Analysis",
+            "Daily Coverage",
+            "Meal Recommendations",
+            "Nutrition Education",
+        ]
+    )
+
+    with tabs[0], section("analysis"):
+        nutrient_analysis()
+
+    with tabs[1], section("coverage"):
+        daily_coverage()
+
+    with tabs[2], section("recommendations"):
+        meal_recommendations()
+
+    with tabs[3], section("education"):
+        nutrition_education()
+
+
+def nutrient_analysis():
+    st.subheader("Nutrient Analysis")
+
+    # Food selection
+    query = st.text_input("Search foods:")
+    selected_food = st.selectbox(
+        "Select a food to analyze:",
+        options=search_index().search_names(query, SEARCH_LIMIT),
+    )
+    amount = st.number_input("Amount (grams):", min_value=1, max_value=1000, value=100)
+
+    if selected_food is None:
+        st.write("No foods match your search.")
+    else:
+        st.write(f"Nutritional information for {amount}g of {selected_food}:")
+
+        # Shared by every session analyzing the same amount of this food
+        with section("analyze"):
+            analysis = reference().analyze(selected_food, amount)
+        nutrients = analysis.nutrients
+
+        # Display nutrient information as a table
+        st.dataframe(analysis.table, width=500)
+
+        # Create a pie chart for macronutrients
+        macros = ["protein", "carbs", "fat"]
+        macro_values = [nutrients[m] for m in macros]
+        fig = pie_chart(macro_values, macros, "Macronutrient Distribution")
+        st.plotly_chart(fig)
+
+        # Display vitamins
+        st.write("Vitamins:", ", ".join(analysis.vitamins))
+
+    if DEBUG:
+        st.sidebar.json(cache_stats())
+
+
+def daily_coverage():
+    st.subheader("Daily Coverage")
+
+    profile = st.session_state.get("profile")
+    if profile is None:
+        st.info(
+            "Reference intakes are for a 30 year old man until you fill in your profile on the Home page."
+        )
+        profile = {"age": 30, "gender": "Male"}
+    calories = st.session_state.get("calorie_goal", st.session_state.get("tdee", 2000))
+
+    # The whole day's plan from the Meal Planner, recipes included
+    book = recipe_book()
+    meal_plan = st.session_state.get("meal_plan", {})
+    _, rows, _ = plan_arrays(book.catalog, meal_plan)
+    if not len(rows):
+        st.write(
+            "Add foods to your meal plan to see how much of each nutrient it covers."
+        )
+        return
+
+    targets, limits = reference_intakes(profile["age"], profile["gender"], calories)
+    totals = plan_nutrition(book.catalog, meal_plan)[1]
+    coverage = day_coverage(book.catalog, rows, totals, targets, limits)
+    st.dataframe(
+        pd.DataFrame(
+            {
+                "In plan": coverage.totals.round(1),
+                "Target": coverage.targets.round(1),
+                "% of target": coverage.percent.round(0),
+                "Limit": coverage.limits.round(1),
+            },
+            index=pd.Index(NUTRIENTS, name="Nutrient"),
+        ),
+        column_config={
+            "% of target": st.column_config.ProgressColumn(
+                format="%d%%", min_value=0, max_value=100
+            )
+        },
+    )
+    over = [n for n, total, limit in zip(NUTRIENTS, totals, limits) if total > limit]
+    if over:
+        st.warning(f"Over the daily limit for {', '.join(over)}.")
+
+    st.write("Vitamins covered:", ", ".join(coverage.vitamins) or "none")
+
+    # Ranked ahead of time over the shared catalog; foods already planned
+    # are skipped
+    index = density_index()
+    planned = {food for items in meal_plan.values() for food, _ in items}
+    short = gaps(coverage)
+    if short or coverage.missing:
+        st.write("Foods that would close the gaps:")
+    for nutrient in short:
+        i = NUTRIENTS.index(nutrient)
+        gap = coverage.targets[i] - coverage.totals[i]
+        foods = index.closers(nutrient, gap, exclude=planned)
+        options = ", ".join(f"{grams}g of {food}" for food, grams in foods)
+        st.write(f"- {nutrient} ({coverage.percent[i]:.0f}%): {options}")
+    for vitamin in coverage.missing:
+        foods = index.closers(vitamin, exclude=planned)
+        if foods:
+            st.write(f"- vitamin {vitamin}: {', '.join(food for food, _ in foods)}")
+
+
+def meal_recommendations():
+    st.subheader("Meal Recommendations")
+
+    # Get user preferences
+    diet_type = st.selectbox(
+        "Diet type:", ["Balanced", "High-protein", "Low-carb", "Vegetarian", "Vegan"]
+    )
+    calorie_target = st.number_input(
+        "Daily calorie target:", min_value=1000, max_value=5000, value=2000
+    )
+
+    if st.button("Generate Meal Plan"):
+        st.write(
+            f"Here's a suggested meal plan for a {diet_type} diet with {calorie_target} calories:"
+        )
+
+        with section("recommend"):
+            meals = recommender().recommend(diet_type, calorie_target)
+        for meal, options in meals.items():
+            st.write(f"\n{meal}:")
+            if not options:
+                st.write("No foods in the catalog match this diet.")
+                continue
+            for food, amount in options[0].foods:
+                st.write(f"- {amount}g of {food}")
+            st.write(f"Total: {describe(options[0])}")
+            for i, option in enumerate(options[1:], start=2):
+                foods = ", ".join(
+                    f"{amount}g of {food}" for food, amount in option.foods
+                )
+                st.caption(f"Option {i}: {foods} ({describe(option)})")
+
+        st.write(
+            "\nNote: This is a basic suggestion. Please consult with a nutritionist for a personalized meal plan."
+        )
+
+
+def nutrition_education():
+    st.subheader("Nutrition Education")
+
+    selected_topic = st.selectbox(
+        "Choose a topic to learn about:", list(EDUCATION_TOPICS)
+    )
+    st.write(EDUCATION_TOPICS[selected_topic])
+
+    st.write("This feature is under development. Check back soon!")
@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+import streamlit as st
+
+from caltrack.profiling import Profiler, deep_size, logger
+
+# Opt-in instrumentation, enabled with CALTRACK_PROFILE=1. Each run is then
+# logged as JSON on the caltrack.profile logger, and with
+# CALTRACK_PROFILE_FILE set the Prometheus metrics are written to that file.
+PROFILE = os.environ.get("CALTRACK_PROFILE") == "1"
+PROFILE_FILE = os.environ.get("CALTRACK_PROFILE_FILE")
+
+MEMORY_EVERY = 10  # Reruns between samples of a session's state size
+WRITE_EVERY = 15.0  # Seconds between writes of the metrics file
+
+# One profiler per process, like the figure cache; sessions only add to it
+PROFILER = Profiler(enabled=PROFILE)
+_last_write = 0.0
+
+if PROFILE and not logger.handlers:
+    logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.INFO)
+
+
+def section(name):
+    # Times the block as a named section of the current page
+    return PROFILER.section(name)
+
+
+def session_memory():
+    # Estimated bytes held by each session state entry, largest first. The
+    # walk stops at the process-wide resources sessions point into: the
+    # cached resources and the catalogs, stores and workers they share.
+    from caltrack.activity_store import ActivityStore
+    from caltrack.food_catalog import FoodCatalog
+    from caltrack.progress_store import ProgressRepository
+    from caltrack.reference import FoodReference
+    from caltrack.sync_worker import SyncWorker
+    from views.resources import reference
+    from views.session import state_store
+
+    shared_types = (
+        FoodCatalog,
+        FoodReference,
+        ActivityStore,
+        ProgressRepository,
+        SyncWorker,
+    )
+    shared = {id(reference()), id(state_store())}
+    sizes = {
+        key: deep_size(value, set(shared), shared_types)
+        for key, value in st.session_state.to_dict().items()
+    }
+    return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+
+@contextmanager
+def profile_run(page):
+    """Profile one run of a page; draws the debug panel with ?debug=1."""
+    global _last_write
+    if not PROFILE:
+        yield
+        return
+
+    st.session_state.setdefault("_session_id", uuid.uuid4().hex)
+    reruns = st.session_state.get("_reruns", 0) + 1
+    st.session_state._reruns = reruns
+    with PROFILER.run(page) as timings:
+        yield
+
+    # Runs cut short by st.rerun() or an error skip the rest
+    fields = {"session": st.session_state._session_id, "rerun": reruns}
+    if reruns % MEMORY_EVERY == 1:
+        memory = session_memory()
+        st.session_state._memory_sample = memory
+        fields["session_state_bytes"] = sum(memory.values())
+        PROFILER.record_memory(fields["session"], fields["session_state_bytes"])
+    PROFILER.log_run(page, timings, **fields)
+    if PROFILE_FILE and time.monotonic() - _last_write >= WRITE_EVERY:
+        _last_write = time.monotonic()
+        PROFILER.write_textfile(PROFILE_FILE)
+
+    if st.query_params.get("debug") == "1":
+        debug_panel(timings, reruns)
+
+
+def debug_panel(timings, reruns):
+    sidebar = st.sidebar.expander("Profiling", expanded=True)
+    sidebar.write(f"Reruns this session: {reruns}")
+    sidebar.text(
+        "Last run:\n"
+        + "\n".join(f"{seconds * 1000:9.1f} ms  {name}" for name, seconds in timings)
+    )
+
+    memory = st.session_state.get("_memory_sample", {})
+    if memory:
+        sidebar.text(
+            f"Session state, sampled every {MEMORY_EVERY} reruns:\n"
+            + "\n".join(
+                f"{nbytes / 1024:9.1f} KiB  {key}"
+                for key, nbytes in list(memory.items())[:10]
+            )
+        )
+
+    snapshot = PROFILER.snapshot()
+    sidebar.download_button(
+        "Download JSON",
+        json.dumps(snapshot, indent=2),
+        "caltrack-profile.json",
+        "application/json",
+    )
+    sidebar.download_button(
+        "Download Prometheus metrics",
+        PROFILER.prometheus(),
+        "caltrack-metrics.prom",
+        "text/plain",
+    )
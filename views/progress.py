@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from caltrack.goals import overall_changes, weight_goal_progress
+from views.charts import line_chart
+from views.profiling import section
+from views.resources import add_progress, progress_repository, progress_window
+
+PROGRESS_WINDOWS = {
+    "Last 30 days": 30,
+    "Last 90 days": 90,
+    "Last year": 365,
+    "All time": None,
+}
+
+
+def render():
+    st.header("Progress Tracking")
+
+    # Tabs for different features
+    tabs = st.tabs(["Log Progress", "View Progress", "Set Goals"])
+
+    with tabs[0], section("log"):
+        log_progress()
+
+    with tabs[1], section("view"):
+        view_progress()
+
+    with tabs[2], section("goals"):
+        set_goals()
+
+
+def log_progress():
+    st.subheader("Log Your Progress")
+
+    # Date selection (default to today)
+    date = st.date_input("Date", datetime.now())
+
+    # Input fields for various measurements
+    weight = st.number_input("Weight (kg)", min_value=0.0, max_value=500.0, step=0.1)
+    body_fat = st.number_input("Body Fat %", min_value=0.0, max_value=100.0, step=0.1)
+    waist = st.number_input(
+        "Waist Circumference (cm)", min_value=0.0, max_value=200.0, step=0.1
+    )
+    chest = st.number_input(
+        "Chest Circumference (cm)", min_value=0.0, max_value=200.0, step=0.1
+    )
+    arms = st.number_input(
+        "Arm Circumference (cm)", min_value=0.0, max_value=100.0, step=0.1
+    )
+    thighs = st.number_input(
+        "Thigh Circumference (cm)", min_value=0.0, max_value=200.0, step=0.1
+    )
+
+    if st.button("Log Progress"):
+        new_data = {
+            "Date": date,
+            # Left empty rather than 0 when only measurements are logged
+            "Weight": weight if weight > 0 else float("nan"),
+            "Body Fat %": body_fat,
+            "Waist": waist,
+            "Chest": chest,
+            "Arms": arms,
+            "Thighs": thighs,
+        }
+        add_progress(new_data)
+        st.success("Progress logged successfully!")
+
+
+def view_progress():
+    st.subheader("View Your Progress")
+
+    window = st.selectbox("Time range:", list(PROGRESS_WINDOWS))
+    days = PROGRESS_WINDOWS[window]
+    start = datetime.now().date() - timedelta(days=days) if days else None
+    # The log is kept sorted and caches this view until the next entry
+    user_data = progress_window(start)
+
+    if user_data.empty:
+        st.warning("No data available. Please log your progress first.")
+        return
+
+    # Select metric to view
+    metric = st.selectbox("Select metric to view:", user_data.columns[1:])
+
+    # Create line chart
+    fig = line_chart(user_data, "Date", metric, f"{metric} Over Time")
+    st.plotly_chart(fig)
+
+    # Display data table
+    st.dataframe(user_data)
+
+    # Calculate and display changes
+    changes = overall_changes(user_data)
+    if changes:
+        st.subheader("Overall Changes")
+        for column, change in changes.items():
+            st.write(f"{column}: {change:.2f}")
+
+
+def set_goals():
+    st.subheader("Set Your Goals")
+
+    # Initialize goals in session state if they don't exist
+    if "goals" not in st.session_state:
+        st.session_state.goals = {}
+
+    # Input fields for goals
+    st.session_state.goals["target_weight"] = st.number_input(
+        "Target Weight (kg)",
+        min_value=0.0,
+        max_value=500.0,
+        step=0.1,
+        value=st.session_state.goals.get("target_weight", 0.0),
+    )
+    st.session_state.goals["target_body_fat"] = st.number_input(
+        "Target Body Fat %",
+        min_value=0.0,
+        max_value=100.0,
+        step=0.1,
+        value=st.session_state.goals.get("target_body_fat", 0.0),
+    )
+    st.session_state.goals["target_date"] = st.date_input(
+        "Target Date",
+        min_value=datetime.now(),
+        value=st.session_state.goals.get(
+            "target_date", datetime.now() + timedelta(days=30)
+        ),
+    )
+
+    if st.button("Set Goals"):
+        st.success("Goals set successfully!")
+
+    # Display current goals
+    st.subheader("Current Goals")
+    for goal, value in st.session_state.goals.items():
+        st.write(f"{goal.replace('_', ' ').title()}: {value}")
+
+    # Calculate and display progress towards goals
+    # First and last weigh-in straight from storage, without the history
+    weights = progress_repository().first_last(st.session_state.user_id, "Weight")
+    if weights and "target_weight" in st.session_state.goals:
+        target_weight = st.session_state.goals["target_weight"]
+        progress = weight_goal_progress(*weights, target_weight)
+
+        if progress is not None:
+            st.subheader("Progress Towards Weight Goal")
+            st.progress(min(max(progress / 100, 0.0), 1.0))
+            st.write(f"{progress:.1f}% towards your weight goal")
+
+    st.write("This feature is under development. Check back soon!")
@@ -0,0 +1,144 @@
+import atexit
+import os
+
+import pandas as pd
+import streamlit as st
+
+from caltrack.food_catalog import FoodCatalog
+from caltrack.food_snapshot import load_catalog
+from caltrack.foods import FOOD_DATABASE
+from caltrack.progress_log import ProgressLog
+from caltrack.progress_store import ProgressRepository
+from caltrack.recipes import RecipeBook
+from caltrack.reference import FoodReference
+
+# Extra consistency checks, enabled with CALTRACK_DEBUG=1
+DEBUG = os.environ.get("CALTRACK_DEBUG") == "1"
+
+SEARCH_LIMIT = 50  # Matches sent to each food selectbox
+
+ACTIVITY_DIR = os.environ.get("CALTRACK_ACTIVITY_DIR", "activity")
+
+PROGRESS_DAYS = 90  # Days of progress history loaded when a session starts
+
+# Food catalog snapshot written by import_foods.py; the built-in foods if unset
+FOODS_PATH = os.environ.get("CALTRACK_FOODS")
+
+
+# The script reruns on every interaction, so the catalog, its indexes and
+# the analysis memo are one resource built once per process and shared by
+# all sessions
+@st.cache_resource
+def reference():
+    if FOODS_PATH:
+        return FoodReference(load_catalog(FOODS_PATH))
+    return FoodReference(FoodCatalog.from_dict(FOOD_DATABASE))
+
+
+def catalog():
+    return reference().catalog
+
+
+def recommender():
+    return reference().recommender
+
+
+def search_index():
+    return reference().search_index
+
+
+def density_index():
+    return reference().density_index
+
+
+def recipe_book():
+    # The user's recipes, rebuilt from their stored definitions when those
+    # change; its catalog holds the shared foods plus one row per recipe
+    if "recipe_book" not in st.session_state:
+        st.session_state.recipe_book = RecipeBook.from_dict(
+            catalog(), st.session_state.get("recipes", {})
+        )
+    return st.session_state.recipe_book
+
+
+def cache_stats():
+    # Hit/miss counters of the shared caches
+    from views.charts import FIGURE_CACHE
+
+    return {
+        "food_analysis": reference().analyses.stats(),
+        "figures": FIGURE_CACHE.stats(),
+    }
+
+
+@st.cache_resource
+def progress_repository():
+    # One database connection per process, shared by all sessions; entries
+    # are kept per user, picked with ?user=<name> in the app URL
+    repository = ProgressRepository(os.environ.get("CALTRACK_DB", "caltrack.db"))
+    atexit.register(repository.close)
+    return repository
+
+
+def progress_log():
+    # The session keeps the user's recent history in memory, loaded once from
+    # storage; progress_window pages older entries in when a view needs them
+    if "progress_log" not in st.session_state:
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=PROGRESS_DAYS)
+        st.session_state.progress_log = ProgressLog.from_frame(
+            progress_repository().window(st.session_state.user_id, start)
+        )
+        st.session_state.progress_loaded_from = start
+    return st.session_state.progress_log
+
+
+def progress_window(start=None):
+    # Logged entries since start, or all of them; only the days not loaded
+    # yet are read from the repository
+    log = progress_log()
+    loaded_from = st.session_state.progress_loaded_from
+    if start is not None:
+        start = pd.Timestamp(start).normalize()
+    if loaded_from is not None and (start is None or start < loaded_from):
+        older = progress_repository().window(
+            st.session_state.user_id, start, loaded_from - pd.Timedelta(days=1)
+        )
+        log.extend(older)
+        st.session_state.progress_loaded_from = start
+    return log.window(start)
+
+
+def add_progress(entry):
+    # Written through to the repository; kept in the session's log only if
+    # it falls in the loaded days, so paging in never reads it twice
+    progress_repository().add(st.session_state.user_id, entry)
+    log = progress_log()
+    loaded_from = st.session_state.progress_loaded_from
+    if loaded_from is None or pd.Timestamp(entry["Date"]) >= loaded_from:
+        log.append(entry)
+
+
+@st.cache_resource
+def activity_store(user_id):
+    # One store per user, shared by their sessions and the sync worker
+    from caltrack.activity_store import ActivityStore, user_root
+
+    return ActivityStore(user_root(ACTIVITY_DIR, user_id))
+
+
+@st.cache_resource
+def sync_worker():
+    # Runs device syncs in the background for all sessions
+    from caltrack.sync_worker import SyncWorker
+
+    return SyncWorker()
+
+
+def fitness_tracker():
+    if "fitness_tracker" not in st.session_state:
+        from caltrack.tracker import MockFitnessTracker
+
+        st.session_state.fitness_tracker = MockFitnessTracker(
+            sink=activity_store(st.session_state.user_id)
+        )
+    return st.session_state.fitness_tracker
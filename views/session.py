@@ -0,0 +1,72 @@
+import os
+
+import streamlit as st
+
+from caltrack.state import dumps, open_state_store
+
+# Session state keys that belong to the user rather than the browser tab.
+# Everything else (widgets, caches, the tracker connection) stays per tab.
+PERSISTED_KEYS = (
+    "meal_plan",
+    "recipes",
+    "goals",
+    "calorie_goal",
+    "tdee",
+    "profile",
+    "intake_log",
+    "tdee_state",
+    "tdee_next_day",
+    "last_sync",
+)
+
+# Derived from persisted keys, rebuilt when those change elsewhere
+DERIVED_KEYS = {
+    "meal_plan": ("meal_totals",),
+    "recipes": ("recipe_book", "meal_totals"),
+}
+
+
+@st.cache_resource
+def state_store():
+    # In-process by default; set CALTRACK_STATE_URL=redis://... for replicas
+    return open_state_store(os.environ.get("CALTRACK_STATE_URL"))
+
+
+def load_user_state():
+    """Copy the user's stored state into session state if it changed.
+
+    Called at the start of each run, so a reconnecting tab, another tab or
+    another replica picks up the latest state.
+    """
+    state, version = state_store().get(st.session_state.user_id)
+    if version == st.session_state.get("_state_version"):
+        return
+    for key in PERSISTED_KEYS:
+        if key in state:
+            st.session_state[key] = state[key]
+            for derived in DERIVED_KEYS.get(key, ()):
+                st.session_state.pop(derived, None)
+    st.session_state._state_version = version
+    st.session_state._state_snapshot = {k: dumps(v) for k, v in state.items()}
+
+
+def save_user_state():
+    """Write the persisted keys this run changed back to the store.
+
+    Only changed keys are merged into the latest stored state, so runs in
+    other tabs or replicas that touched other keys are not overwritten; a
+    concurrent write to the same user retries against the new version.
+    """
+    snapshot = st.session_state.get("_state_snapshot", {})
+    changed = {
+        key: st.session_state[key]
+        for key in PERSISTED_KEYS
+        if key in st.session_state and dumps(st.session_state[key]) != snapshot.get(key)
+    }
+    if not changed:
+        return
+    state, version = state_store().update(
+        st.session_state.user_id, lambda state: state.update(changed)
+    )
+    st.session_state._state_version = version
+    st.session_state._state_snapshot = {k: dumps(v) for k, v in state.items()}